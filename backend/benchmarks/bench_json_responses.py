@@ -0,0 +1,103 @@
+"""
+Benchmark listing serialization: time to serialize a /jobs/for-you page and bytes on wire.
+
+Builds a synthetic corpus in a temporary SQLite database, renders one
+/jobs/for-you page, then compares FastAPI's default path (jsonable_encoder +
+JSONResponse) with json_responses.dumps (stdlib json, and orjson when
+installed), and the raw body size with its gzip and brotli sizes.
+
+Usage (from backend/):
+    python benchmarks/bench_json_responses.py
+    python benchmarks/bench_json_responses.py --jobs 3000 --size 100
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+TITLES = [
+    "Stage Ingénieur logiciel Python", "Software Engineer Intern", "Stage avionique", "Stage mécanique CATIA",
+    "Internship project management", "Stage R&D propulsion", "Data analyst intern", "Stage qualité production",
+    "Stage état de l'art charge utile", "Stage maintenance aéronautique",
+]
+LOCATIONS = ["Toulouse, France", "Blagnac (31)", "Paris", "Les Mureaux", "Élancourt", "Vernon (27)", "Bordeaux, France", None]
+MODULES = ["airbus", "thales", "cnes", "ariane"]
+
+
+def best_time(function, repeat):
+    """Best wall time of a call, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=3000, help="Number of jobs in the synthetic corpus")
+    parser.add_argument("--size", type=int, default=100, help="Page size")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    database_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(database_dir.name) / 'bench.db'}"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    import json_responses
+    import main as app_main
+    from database import SessionLocal, init_db
+    from repositories.job_repository import JobRepository
+    from repositories.profile_repository import ProfileRepository
+
+    init_db()
+    db = SessionLocal()
+    rnd = random.Random(args.seed)
+    job_repo = JobRepository(db)
+    tagging_service = app_main.tagging_service
+    for index in range(args.jobs):
+        title = f"{rnd.choice(TITLES)} #{index}"
+        tags = tagging_service.tagJob(title)
+        job_repo.add_job({
+            "link": f"https://example.com/jobs/{index}",
+            "module": rnd.choice(MODULES),
+            "company": "Company",
+            "title": title,
+            "location": rnd.choice(LOCATIONS),
+            "tags": tags,
+            "tag_mask": tagging_service.tagMask(tags),
+            "new": rnd.random() < 0.2,
+        })
+    ProfileRepository(db).save_profile({"tags": ["software", "aerospace"], "location": "Toulouse"})
+    payload = app_main._build_personalized_page(db, 1, args.size, None, None, None, None)
+    db.close()
+
+    print(f"/jobs/for-you page: {len(payload['jobs'])} jobs out of {args.jobs}")
+    print(f"  jsonable_encoder + JSONResponse: {best_time(lambda: JSONResponse(jsonable_encoder(payload)).body, args.repeat):.3f} ms")
+    print(f"  stdlib json: {best_time(lambda: json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), args.repeat):.3f} ms")
+    if json_responses.orjson is not None:
+        print(f"  orjson: {best_time(lambda: json_responses.orjson.dumps(payload), args.repeat):.3f} ms")
+
+    body = json_responses.dumps(payload)
+    print(f"bytes on wire: {len(body):,} uncompressed (before)")
+    print(f"  gzip (level {json_responses.GZIP_LEVEL}): {len(gzip.compress(body, compresslevel=json_responses.GZIP_LEVEL)):,}")
+    if json_responses.brotli is not None:
+        print(f"  brotli (quality {json_responses.BROTLI_QUALITY}): {len(json_responses.brotli.compress(body, quality=json_responses.BROTLI_QUALITY)):,}")
+
+    database_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark TaggingService.tagJob: accuracy on the labelled titles and time per job.
+
+Usage (from backend/):
+    python benchmarks/bench_tagging.py
+    python benchmarks/bench_tagging.py --backend-dir /tmp/before/backend
+
+--backend-dir benchmarks the tagging code of another checkout, e.g. the
+substring matcher before word-boundary matching:
+    git worktree add /tmp/before <commit>~1
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LABELLED_TITLES = BACKEND_DIR / "tests" / "data" / "labelled_titles.json"
+
+
+def accuracy(tagging_service, labelled_titles):
+    """Precision and recall of the assigned tags over the labelled titles."""
+    true_positives = false_positives = false_negatives = 0
+    for entry in labelled_titles:
+        found, expected = set(tagging_service.tagJob(entry["title"])), set(entry["tags"])
+        true_positives += len(found & expected)
+        false_positives += len(found - expected)
+        false_negatives += len(expected - found)
+    return (
+        true_positives / (true_positives + false_positives),
+        true_positives / (true_positives + false_negatives),
+    )
+
+
+def realistic_texts(tagging_service, labelled_titles, count, seed):
+    """Title and description texts drawn from title words and dictionary keywords."""
+    rnd = random.Random(seed)
+    vocabulary = [word for entry in labelled_titles for word in entry["title"].split()]
+    vocabulary += [keyword for keywords in tagging_service._category_keywords.values() for keyword in keywords]
+    return [" ".join(rnd.choice(vocabulary) for _ in range(rnd.randint(5, 60))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend-dir", type=Path, default=BACKEND_DIR, help="Backend checkout to benchmark")
+    parser.add_argument("--jobs", type=int, default=20000, help="Number of texts to tag")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.backend_dir.resolve()))
+    from tagging_service import TaggingService
+
+    tagging_service = TaggingService()
+    labelled_titles = json.loads(LABELLED_TITLES.read_text(encoding="utf-8"))
+    precision, recall = accuracy(tagging_service, labelled_titles)
+    print(f"labelled titles: {len(labelled_titles)}  precision {precision:.2f}  recall {recall:.2f}")
+
+    texts = realistic_texts(tagging_service, labelled_titles, args.jobs, args.seed)
+    start = time.perf_counter()
+    for text in texts:
+        tagging_service.tagJob(text)
+    elapsed = time.perf_counter() - start
+    print(f"tagJob: {elapsed / len(texts) * 1e6:.1f} us/job over {len(texts)} texts")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,11 @@ This module provides:
 - Dependency injection helper for FastAPI
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Dict, Generator
+from geo import haversine_km
 import os
 
 # Database configuration
@@ -25,6 +26,12 @@ engine = create_engine(
     echo=False,  # Set to True for SQL query logging during development
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _register_sql_functions(dbapi_connection, connection_record):
+        """Expose Python helpers as SQL functions (SQLite has no trigonometry by default)."""
+        dbapi_connection.create_function("haversine_km", 4, haversine_km, deterministic=True)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -32,6 +39,124 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# Full-text search index over job titles, companies and locations (SQLite FTS5).
+# It is an external-content table kept in sync with `jobs` by triggers, so every
+# write path (ORM or bulk SQL) updates it in the same transaction.
+JOBS_FTS_TABLE = "jobs_fts"
+
+_JOBS_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {JOBS_FTS_TABLE} USING fts5(
+        title, company, location,
+        content='jobs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {JOBS_FTS_TABLE}(rowid, title, company, location)
+        VALUES (new.id, new.title, new.company, new.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {JOBS_FTS_TABLE}({JOBS_FTS_TABLE}, rowid, title, company, location)
+        VALUES ('delete', old.id, old.title, old.company, old.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, location ON jobs BEGIN
+        INSERT INTO {JOBS_FTS_TABLE}({JOBS_FTS_TABLE}, rowid, title, company, location)
+        VALUES ('delete', old.id, old.title, old.company, old.location);
+        INSERT INTO {JOBS_FTS_TABLE}(rowid, title, company, location)
+        VALUES (new.id, new.title, new.company, new.location);
+    END
+    """,
+]
+
+
+# Whether the SQLite library behind each database URL was built with FTS5
+_fts5_support: Dict[str, bool] = {}
+
+
+def supports_full_text_search(bind) -> bool:
+    """
+    Check whether the FTS5 job search index is available on a connection.
+    
+    SQLite builds without FTS5 (ENABLE_FTS5 missing from its compile options)
+    cannot create the index, so they fall back to substring search. The
+    check runs once per database URL.
+    
+    Args:
+        bind: SQLAlchemy engine or connection
+        
+    Returns:
+        True when the database is SQLite with FTS5 (index maintained by init_db)
+    """
+    if bind.dialect.name != "sqlite":
+        return False
+    
+    url = str(bind.engine.url)
+    if url not in _fts5_support:
+        with bind.engine.connect() as conn:
+            compile_options = {option for (option,) in conn.execute(text("PRAGMA compile_options"))}
+        _fts5_support[url] = "ENABLE_FTS5" in compile_options
+    return _fts5_support[url]
+
+
+def init_search_index():
+    """
+    Create the FTS5 job search index and its sync triggers.
+    
+    The index is rebuilt from the `jobs` table when it is created for the
+    first time, so databases from earlier versions get searchable as well.
+    """
+    if not supports_full_text_search(engine):
+        return
+    
+    with engine.begin() as conn:
+        index_exists = inspect(conn).has_table(JOBS_FTS_TABLE)
+        for statement in _JOBS_FTS_DDL:
+            conn.execute(text(statement))
+        if not index_exists:
+            conn.execute(text(f"INSERT INTO {JOBS_FTS_TABLE}({JOBS_FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def add_missing_columns():
+    """
+    Add model columns missing from existing tables (SQLite only).
+    
+    create_all never alters existing tables, so databases from earlier
+    versions get new nullable columns, or columns with a constant server
+    default (existing rows take the default), and their indexes added here.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_definition = column.type.compile(dialect=conn.dialect)
+                # Only constant (string) server defaults can fill existing rows
+                default = getattr(column.server_default, "arg", None)
+                if isinstance(default, str):
+                    column_definition += f" DEFAULT '{default}'"
+                    if not column.nullable:
+                        column_definition += " NOT NULL"
+                elif not column.nullable:
+                    continue
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_definition}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
 def init_db():
     """
     Initialize database by creating all tables.
@@ -40,6 +165,8 @@ def init_db():
     all tables exist before any database operations.
     """
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    init_search_index()
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -0,0 +1,76 @@
+"""
+Geo helpers - Great-circle distances and bounding boxes for radius filters.
+
+A radius query first keeps the rows inside a latitude/longitude bounding box
+(cheap, served by the indexed coordinate columns), then checks the exact
+haversine distance on what is left.
+"""
+
+import math
+from typing import Optional, Tuple
+
+# Mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(
+    latitude1: Optional[float],
+    longitude1: Optional[float],
+    latitude2: Optional[float],
+    longitude2: Optional[float],
+) -> Optional[float]:
+    """
+    Compute the great-circle distance between two points.
+    
+    Also registered as the `haversine_km` SQL function on SQLite connections.
+    
+    Args:
+        latitude1: Latitude of the first point in degrees
+        longitude1: Longitude of the first point in degrees
+        latitude2: Latitude of the second point in degrees
+        longitude2: Longitude of the second point in degrees
+    
+    Returns:
+        Distance in kilometers, or None if a coordinate is missing
+    """
+    if latitude1 is None or longitude1 is None or latitude2 is None or longitude2 is None:
+        return None
+    
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    Compute a latitude/longitude box containing every point within a radius.
+    
+    Args:
+        latitude: Latitude of the center in degrees
+        longitude: Longitude of the center in degrees
+        radius_km: Radius in kilometers
+    
+    Returns:
+        Tuple of (min_latitude, max_latitude, min_longitude, max_longitude).
+        The longitude bounds are None when the box reaches a pole or crosses
+        the antimeridian (no longitude restriction then).
+    """
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    delta_latitude = math.degrees(angular_radius)
+    min_latitude = latitude - delta_latitude
+    max_latitude = latitude + delta_latitude
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90.0), min(max_latitude, 90.0), None, None
+    
+    # Widest longitude offset of the circle around the center
+    sin_delta_longitude = math.sin(angular_radius) / math.cos(math.radians(latitude))
+    if sin_delta_longitude >= 1:
+        return min_latitude, max_latitude, None, None
+    delta_longitude = math.degrees(math.asin(sin_delta_longitude))
+    min_longitude = longitude - delta_longitude
+    max_longitude = longitude + delta_longitude
+    if min_longitude < -180 or max_longitude > 180:
+        return min_latitude, max_latitude, None, None
+    return min_latitude, max_latitude, min_longitude, max_longitude
@@ -0,0 +1,72 @@
+"""
+HTTP caching helpers - ETag / If-None-Match support for read endpoints.
+
+ETags are derived from the data version (bumped by every repository write)
+and the request path and query parameters, so they can be computed and
+compared without loading or serializing any data.
+"""
+
+import hashlib
+from fastapi import Request, Response
+
+
+def compute_etag(version: int, request: Request) -> str:
+    """
+    Compute a weak ETag for a request at a given data version.
+    
+    Args:
+        version: Current data version
+        request: Incoming request (path and query parameters are hashed)
+        
+    Returns:
+        Weak ETag header value
+    """
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(f"{request.url.path}?{params}".encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+        
+    Returns:
+        True if the client already holds the current representation
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison: ignore the W/ prefix on both sides
+    opaque_tag = etag.removeprefix("W/")
+    return "*" in candidates or any(candidate.removeprefix("W/") == opaque_tag for candidate in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build an empty 304 Not Modified response.
+    
+    Args:
+        etag: Current ETag of the resource
+        
+    Returns:
+        Response with status 304 and caching headers
+    """
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    Attach ETag and revalidation headers to a response.
+    
+    Args:
+        response: Response to decorate
+        etag: Current ETag of the resource
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,134 @@
+"""
+JSON responses - Fast serialization and content-encoding negotiation.
+
+Listing endpoints return large payloads built from plain dicts that are
+already JSON-compatible, so they bypass FastAPI's jsonable_encoder and are
+serialized directly (with orjson when installed, the standard library
+otherwise). Bodies above a small threshold are gzip- or brotli-compressed
+according to the client's Accept-Encoding header.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional, gzip is always available
+    brotli = None
+
+
+# Bodies smaller than this are not worth compressing
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Serialize a JSON-compatible payload to compact UTF-8 bytes.
+    
+    Args:
+        payload: Dicts, lists, strings, numbers, booleans and None only
+        
+    Returns:
+        Serialized JSON body
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """
+    Pick the best supported content encoding accepted by the client.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def encode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    """
+    Compress a body with the negotiated encoding.
+    
+    Args:
+        body: Serialized response body
+        encoding: "br", "gzip" or None
+        
+    Returns:
+        Compressed body (or the original body for identity)
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def json_body_response(body: bytes, encoding: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Wrap an already serialized (and possibly compressed) JSON body in a Response.
+    
+    Args:
+        body: Response body bytes
+        encoding: Content encoding applied to body, if any
+        headers: Extra headers (e.g. ETag)
+        
+    Returns:
+        JSON Response with Content-Encoding and Vary headers set
+    """
+    response_headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+    if headers:
+        response_headers.update(headers)
+    return Response(content=body, media_type="application/json", headers=response_headers)
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized with dumps(), skipping jsonable_encoder."""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        """Serialize content with the fast JSON path."""
+        return dumps(content)
+
+
+def compressed_json_response(request: Request, payload: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize a payload and compress it according to Accept-Encoding.
+    
+    Args:
+        request: Incoming request (for encoding negotiation)
+        payload: JSON-compatible payload
+        headers: Extra headers (e.g. ETag)
+        
+    Returns:
+        JSON Response, compressed when large enough and accepted by the client
+    """
+    body = dumps(payload)
+    encoding = negotiate_encoding(request) if len(body) >= COMPRESSION_MIN_BYTES else None
+    return json_body_response(encode_body(body, encoding), encoding, headers)
@@ -0,0 +1,138 @@
+"""
+KeywordMatcher - Word-boundary keyword and phrase matching with a token trie.
+
+Texts and keywords are normalized into the same token stream (lowercase,
+accents folded, punctuation dropped, plural "s" removed), and keyword groups
+are compiled once into a trie over tokens whose nodes carry the bitmask of the
+groups (e.g. tag categories) whose keyword ends there. A single-word keyword
+is one dictionary lookup per token; phrases extend the walk only while the
+following tokens keep matching.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_SEPARATOR = re.compile(r"[\W_]+")
+
+# Version of the normalization and matching rules below. Bump it when they
+# change so that tags computed under the previous rules get re-tagged.
+MATCHER_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into normalized tokens.
+    
+    "Systèmes embarqués" and "systeme embarque" give the same tokens, and so
+    do "R&D" and "r d".
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        List of tokens in text order
+    """
+    if not text:
+        return []
+    
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text)  # Combining accents would split words
+    
+    # Whitespace split first: words repeat across jobs, so their normalization is cached
+    return list(chain.from_iterable(map(_normalize_word, text.lower().split())))
+
+
+@lru_cache(maxsize=65536)
+def _normalize_word(word: str) -> Tuple[str, ...]:
+    """Split a lowercase word on punctuation, folding accents and plural "s"."""
+    if not word.isascii():
+        word = "".join(char for char in unicodedata.normalize("NFKD", word) if not unicodedata.combining(char))
+    return tuple(
+        token[:-1] if len(token) > 3 and token.endswith("s") else token
+        for token in _TOKEN_SEPARATOR.split(word)
+        if token
+    )
+
+
+class KeywordMatcher:
+    """Token trie reporting which keyword groups occur in a text."""
+    
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        """
+        Compile keyword groups into a token trie.
+        
+        Args:
+            groups: Dictionary mapping group names to keywords or phrases;
+                group i is bit i of the masks returned by match
+        """
+        self.groups: List[str] = list(groups)
+        self._all_groups = (1 << len(self.groups)) - 1
+        
+        # Node: [mask of the groups with a keyword ending here, children by token]
+        self._root: Dict[str, list] = {}
+        for bit, keywords in enumerate(groups.values()):
+            for keyword in keywords:
+                tokens = tokenize(keyword)
+                if not tokens:
+                    continue
+                children = self._root
+                for token in tokens:
+                    node = children.setdefault(token, [0, {}])
+                    children = node[1]
+                node[0] |= 1 << bit
+    
+    def match(self, text: str) -> int:
+        """
+        Find the groups having at least one keyword occurring in a text.
+        
+        Keywords match whole tokens only ("ai" does not match "maintenance"),
+        and phrases match consecutive tokens.
+        
+        Args:
+            text: Raw text to scan
+        
+        Returns:
+            Bitmask of the matching groups (bit i = i-th group)
+        """
+        root = self._root
+        all_groups = self._all_groups
+        tokens = tokenize(text)
+        token_count = len(tokens)
+        
+        found = 0
+        for position, token in enumerate(tokens):
+            node = root.get(token)
+            if node is None:
+                continue
+            found |= node[0]
+            
+            # Extend phrases over the following tokens
+            children = node[1]
+            following = position + 1
+            while children and following < token_count:
+                node = children.get(tokens[following])
+                if node is None:
+                    break
+                found |= node[0]
+                children = node[1]
+                following += 1
+            
+            if found == all_groups:
+                break
+        return found
+    
+    def match_groups(self, text: str) -> List[str]:
+        """
+        Find the names of the groups having a keyword occurring in a text.
+        
+        Args:
+            text: Raw text to scan
+        
+        Returns:
+            List of group names in group order
+        """
+        found = self.match(text)
+        return [group for bit, group in enumerate(self.groups) if found >> bit & 1]
@@ -0,0 +1,311 @@
+"""
+LocationService - Normalizes free-text job locations into canonical places.
+
+Scrapers return locations in many formats ("Toulouse, France", "Blagnac (31)",
+"31700 Blagnac Cedex", "Hamburg, Germany"...). This module folds accents and
+punctuation and resolves a location string into a chain of canonical keys,
+from the country down to the most specific place found:
+
+    country ("france") > region ("occitanie") > department ("31") > city ("blagnac")
+
+Resolution only uses the compact reference data below (French regions and
+departments, common countries) and the bundled gazetteer of the cities where
+jobs are usually posted, which also gives city coordinates. Unknown city
+names are kept as-is under the most specific known area.
+"""
+
+import csv
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+
+# Region -> department codes (France)
+FRENCH_REGIONS = {
+    "auvergne rhone alpes": ["01", "03", "07", "15", "26", "38", "42", "43", "63", "69", "73", "74"],
+    "bourgogne franche comte": ["21", "25", "39", "58", "70", "71", "89", "90"],
+    "bretagne": ["22", "29", "35", "56"],
+    "centre val de loire": ["18", "28", "36", "37", "41", "45"],
+    "corse": ["2a", "2b"],
+    "grand est": ["08", "10", "51", "52", "54", "55", "57", "67", "68", "88"],
+    "hauts de france": ["02", "59", "60", "62", "80"],
+    "ile de france": ["75", "77", "78", "91", "92", "93", "94", "95"],
+    "normandie": ["14", "27", "50", "61", "76"],
+    "nouvelle aquitaine": ["16", "17", "19", "23", "24", "33", "40", "47", "64", "79", "86", "87"],
+    "occitanie": ["09", "11", "12", "30", "31", "32", "34", "46", "48", "65", "66", "81", "82"],
+    "pays de la loire": ["44", "49", "53", "72", "85"],
+    "provence alpes cote d azur": ["04", "05", "06", "13", "83", "84"],
+    "guadeloupe": ["971"],
+    "martinique": ["972"],
+    "guyane": ["973"],
+    "la reunion": ["974"],
+    "mayotte": ["976"],
+}
+
+REGION_ALIASES = {
+    "paca": "provence alpes cote d azur",
+    "idf": "ile de france",
+    "reunion": "la reunion",
+    "guyane francaise": "guyane",
+    "french guiana": "guyane",
+}
+
+# Department code -> name (France)
+FRENCH_DEPARTMENTS = {
+    "01": "ain", "02": "aisne", "03": "allier", "04": "alpes de haute provence", "05": "hautes alpes",
+    "06": "alpes maritimes", "07": "ardeche", "08": "ardennes", "09": "ariege", "10": "aube",
+    "11": "aude", "12": "aveyron", "13": "bouches du rhone", "14": "calvados", "15": "cantal",
+    "16": "charente", "17": "charente maritime", "18": "cher", "19": "correze", "2a": "corse du sud",
+    "2b": "haute corse", "21": "cote d or", "22": "cotes d armor", "23": "creuse", "24": "dordogne",
+    "25": "doubs", "26": "drome", "27": "eure", "28": "eure et loir", "29": "finistere",
+    "30": "gard", "31": "haute garonne", "32": "gers", "33": "gironde", "34": "herault",
+    "35": "ille et vilaine", "36": "indre", "37": "indre et loire", "38": "isere", "39": "jura",
+    "40": "landes", "41": "loir et cher", "42": "loire", "43": "haute loire", "44": "loire atlantique",
+    "45": "loiret", "46": "lot", "47": "lot et garonne", "48": "lozere", "49": "maine et loire",
+    "50": "manche", "51": "marne", "52": "haute marne", "53": "mayenne", "54": "meurthe et moselle",
+    "55": "meuse", "56": "morbihan", "57": "moselle", "58": "nievre", "59": "nord",
+    "60": "oise", "61": "orne", "62": "pas de calais", "63": "puy de dome", "64": "pyrenees atlantiques",
+    "65": "hautes pyrenees", "66": "pyrenees orientales", "67": "bas rhin", "68": "haut rhin", "69": "rhone",
+    "70": "haute saone", "71": "saone et loire", "72": "sarthe", "73": "savoie", "74": "haute savoie",
+    "75": "paris", "76": "seine maritime", "77": "seine et marne", "78": "yvelines", "79": "deux sevres",
+    "80": "somme", "81": "tarn", "82": "tarn et garonne", "83": "var", "84": "vaucluse",
+    "85": "vendee", "86": "vienne", "87": "haute vienne", "88": "vosges", "89": "yonne",
+    "90": "territoire de belfort", "91": "essonne", "92": "hauts de seine", "93": "seine saint denis",
+    "94": "val de marne", "95": "val d oise", "971": "guadeloupe", "972": "martinique", "973": "guyane",
+    "974": "la reunion", "976": "mayotte",
+}
+
+# Country -> aliases (English, French and native names, common codes)
+COUNTRIES = {
+    "france": ["france", "fr"],
+    "germany": ["germany", "allemagne", "deutschland"],
+    "spain": ["spain", "espagne", "espana"],
+    "united kingdom": ["united kingdom", "uk", "royaume uni", "great britain", "england", "angleterre"],
+    "italy": ["italy", "italie", "italia"],
+    "belgium": ["belgium", "belgique", "belgie"],
+    "netherlands": ["netherlands", "pays bas", "nederland"],
+    "switzerland": ["switzerland", "suisse", "schweiz"],
+    "luxembourg": ["luxembourg"],
+    "portugal": ["portugal"],
+    "poland": ["poland", "pologne", "polska"],
+    "sweden": ["sweden", "suede", "sverige"],
+    "norway": ["norway", "norvege", "norge"],
+    "austria": ["austria", "autriche", "osterreich"],
+    "united states": ["united states", "usa", "us", "etats unis", "united states of america"],
+    "canada": ["canada"],
+    "mexico": ["mexico", "mexique"],
+    "brazil": ["brazil", "bresil", "brasil"],
+    "morocco": ["morocco", "maroc"],
+    "tunisia": ["tunisia", "tunisie"],
+    "india": ["india", "inde"],
+    "china": ["china", "chine"],
+    "japan": ["japan", "japon"],
+    "singapore": ["singapore", "singapour"],
+    "australia": ["australia", "australie"],
+    "united arab emirates": ["united arab emirates", "uae", "emirats arabes unis"],
+}
+
+# Offline city gazetteer: canonical city key, parent (department code or country) and coordinates
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.tsv")
+
+# Words dropped from location strings ("31700 Blagnac Cedex")
+IGNORED_WORDS = {"cedex", "site", "campus"}
+
+# Abbreviations expanded before matching ("St Médard" -> "saint medard")
+WORD_ALIASES = {"st": "saint", "ste": "sainte"}
+
+
+class LocationService:
+    """Service resolving location strings into canonical place keys."""
+    
+    def __init__(self):
+        """Initialize LocationService with lookup tables built from the reference data and gazetteer."""
+        self._department_regions = {
+            code: region for region, codes in FRENCH_REGIONS.items() for code in codes
+        }
+        self._department_codes = {name: code for code, name in FRENCH_DEPARTMENTS.items()}
+        self._country_aliases = {
+            alias: country for country, aliases in COUNTRIES.items() for alias in aliases
+        }
+        
+        # City -> department code (France) or country, and city -> (latitude, longitude)
+        self._french_cities: Dict[str, str] = {}
+        self._foreign_cities: Dict[str, str] = {}
+        self._city_coordinates: Dict[str, Tuple[float, float]] = {}
+        self._loadGazetteer(GAZETTEER_PATH)
+        
+        self._city_pattern = re.compile(
+            r"\b(" + "|".join(
+                re.escape(city) for city in sorted(self._city_coordinates, key=len, reverse=True)
+            ) + r")\b"
+        )
+    
+    def normalizeText(self, text: str) -> str:
+        """
+        Normalize a location fragment for matching.
+        
+        Folds case and accents, turns punctuation into spaces and expands
+        common abbreviations ("Saint-Médard" and "St Medard" both give
+        "saint medard").
+        
+        Args:
+            text: Raw text to normalize
+        
+        Returns:
+            Normalized text (lowercase ASCII words separated by single spaces)
+        """
+        if not text:
+            return ""
+        
+        folded = unicodedata.normalize("NFKD", text.lower())
+        folded = "".join(char for char in folded if not unicodedata.combining(char))
+        words = re.sub(r"[^\w]+", " ", folded).split()
+        return " ".join(WORD_ALIASES.get(word, word) for word in words if word not in IGNORED_WORDS)
+    
+    def parseLocation(self, location: Optional[str]) -> List[Tuple[str, str]]:
+        """
+        Resolve a location string into its chain of canonical places.
+        
+        Args:
+            location: Raw location as scraped (e.g. "Blagnac (31)")
+        
+        Returns:
+            List of (kind, key) tuples from the broadest place to the most
+            specific one, e.g. [("country", "france"), ("region", "occitanie"),
+            ("department", "31"), ("city", "blagnac")]. Empty if nothing
+            usable is left after normalization.
+        """
+        if not location:
+            return []
+        
+        country = region = department = city = None
+        postal_code = None
+        unknown_segments = []
+        
+        for segment in re.split(r"[,;/|()\[\]]+|\s+-\s+", location):
+            text = self.normalizeText(segment)
+            
+            # Postal codes are only French once the country is known ("85748, Germany")
+            postal_codes = re.findall(r"\b\d{5}\b", text)
+            if postal_codes:
+                postal_code = postal_code or postal_codes[0]
+                text = " ".join(re.sub(r"\b\d{5}\b", " ", text).split())
+            if not text:
+                continue
+            
+            # Country written after the city in the same segment ("stuttgart deutschland")
+            if text not in self._city_coordinates and text not in self._country_aliases:
+                text, trailing_country = self._splitTrailingCountry(text)
+                country = country or trailing_country
+            
+            if text in self._city_coordinates:
+                city = city or text
+            elif text in self._country_aliases:
+                country = country or self._country_aliases[text]
+            elif text in FRENCH_REGIONS or text in REGION_ALIASES:
+                region = region or REGION_ALIASES.get(text, text)
+            elif text in FRENCH_DEPARTMENTS:
+                department = department or text
+            elif text in self._department_codes:
+                department = department or self._department_codes[text]
+            else:
+                unknown_segments.append(text)
+        
+        if city is None and unknown_segments:
+            # Known city inside a longer segment ("toulouse blagnac airport"), else the raw name
+            found = self._city_pattern.search(unknown_segments[0])
+            city = found.group(1) if found else unknown_segments[0]
+        
+        # Postal codes give the department ("31700" -> "31", "97310" -> "973")
+        if postal_code is not None and country in (None, "france"):
+            department = department or self._departmentOfPostalCode(postal_code)
+        
+        return self._buildChain(country, region, department, city)
+    
+    def getCityCoordinates(self, city: str) -> Optional[Tuple[float, float]]:
+        """
+        Get the coordinates of a canonical city from the gazetteer.
+        
+        Args:
+            city: Canonical city key (as returned by parseLocation)
+            
+        Returns:
+            Tuple of (latitude, longitude), or None if the city is not in the gazetteer
+        """
+        return self._city_coordinates.get(city)
+    
+    def locate(self, location: Optional[str]) -> Optional[Tuple[float, float]]:
+        """
+        Get the coordinates of a location string.
+        
+        Args:
+            location: Raw location string (e.g. "Toulouse, France")
+            
+        Returns:
+            Tuple of (latitude, longitude) of its city, or None if it does not
+            resolve to a city of the gazetteer
+        """
+        chain = self.parseLocation(location)
+        if not chain or chain[-1][0] != "city":
+            return None
+        return self.getCityCoordinates(chain[-1][1])
+    
+    def _loadGazetteer(self, path: str) -> None:
+        """Load city parents and coordinates from the gazetteer file."""
+        with open(path, encoding="utf-8", newline="") as gazetteer:
+            rows = csv.DictReader((line for line in gazetteer if not line.startswith("#")), delimiter="\t")
+            for row in rows:
+                city, parent = row["city"], row["parent"]
+                if parent in FRENCH_DEPARTMENTS:
+                    self._french_cities[city] = parent
+                else:
+                    self._foreign_cities[city] = parent
+                self._city_coordinates[city] = (float(row["latitude"]), float(row["longitude"]))
+    
+    def _buildChain(
+        self,
+        country: Optional[str],
+        region: Optional[str],
+        department: Optional[str],
+        city: Optional[str],
+    ) -> List[Tuple[str, str]]:
+        """Complete the parsed places with their known parents, broadest first."""
+        if city in self._french_cities and country in (None, "france"):
+            department = self._french_cities[city]
+        elif city in self._foreign_cities:
+            country = self._foreign_cities[city]
+        
+        if country not in (None, "france"):
+            # French regions and departments do not apply abroad ("Vienne, Autriche")
+            region = department = None
+        elif department is not None:
+            region = self._department_regions[department]
+        if region is not None:
+            country = "france"
+        
+        chain = []
+        for kind, key in (("country", country), ("region", region), ("department", department), ("city", city)):
+            if key is not None:
+                chain.append((kind, key))
+        return chain
+    
+    def _splitTrailingCountry(self, text: str) -> Tuple[str, Optional[str]]:
+        """Split a trailing country alias off a segment ("stuttgart deutschland")."""
+        words = text.split()
+        for size in range(min(len(words) - 1, 4), 0, -1):
+            alias = " ".join(words[-size:])
+            if alias in self._country_aliases:
+                return " ".join(words[:-size]), self._country_aliases[alias]
+        return text, None
+    
+    @staticmethod
+    def _departmentOfPostalCode(postal_code: str) -> Optional[str]:
+        """Department code of a French postal code (None if unknown)."""
+        if postal_code.startswith("97"):
+            code = postal_code[:3]
+        elif postal_code.startswith("20"):
+            code = "2a" if postal_code < "20200" else "2b"
+        else:
+            code = postal_code[:2]
+        return code if code in FRENCH_DEPARTMENTS else None
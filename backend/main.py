@@ -1,20 +1,44 @@
 # --- BASE IMPORTS ---
 import asyncio
+import bisect
+import csv
+import io
 import math
+import os
+from datetime import datetime, timezone
 
 # --- APP IMPORTS ---
-from fastapi import FastAPI, Body, Query, HTTPException, UploadFile, File, Form, Depends
+from fastapi import FastAPI, Body, Query, HTTPException, UploadFile, File, Form, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from config import ACTIVE_SCRAPERS
-from tagging_service import TaggingService
+from tagging_service import TAG_MEMO_SIZE, TaggingService
 from scoring_engine import ScoringEngine
+from vectorized_scoring import NUMPY_AVAILABLE, VectorizedScoringEngine
 from cv_parser import CVParser
 from maintenance_service import MaintenanceService
-from database import get_db, init_db
+from database import SessionLocal, get_db, init_db
+from pagination import encode_cursor, decode_cursor
+from http_cache import compute_etag, etag_matches, not_modified, set_etag
+from response_cache import ResponseCache
+from score_cache import PersonalizedScoreCache
+from json_responses import (
+    COMPRESSION_MIN_BYTES,
+    FastJSONResponse,
+    compressed_json_response,
+    dumps,
+    encode_body,
+    json_body_response,
+    negotiate_encoding,
+)
 from repositories.job_repository import JobRepository
-from repositories.profile_repository import ProfileRepository
+from repositories.profile_repository import DEFAULT_PROFILE_ID, ProfileRepository
 from repositories.application_repository import ApplicationRepository
+from repositories.version_repository import VersionRepository
+from repositories.location_repository import LocationRepository
+from repositories.tag_memo_repository import TagMemoRepository
+from models import Job, UserApplication, UserProfile
 import inspect
 import traceback
 # -------------------
@@ -26,13 +50,190 @@ app = FastAPI()
 def startup_event():
     """Initialize database tables on application startup."""
     init_db()
+    
+    # Resynchronize materialized facet counts and the tag index with the jobs table
+    db = SessionLocal()
+    try:
+        job_repo = JobRepository(db)
+        job_repo.rebuild_facets()
+        job_repo.rebuild_job_tags()
+        job_repo.compact_change_log(CHANGE_LOG_RETAINED_VERSIONS)
+        job_repo.backfill_tag_masks(tagging_service.tagMask)
+        job_repo.backfill_locations()
+        job_repo.refresh_freshness()
+        
+        # Warm the tagging memo with the most recently used job texts
+        if TAG_MEMO_PERSIST:
+            tagging_service.loadMemo(TagMemoRepository(db).get_recent(TAG_MEMO_SIZE))
+    finally:
+        db.close()
     print("✅ Database initialized")
 
+
+# Persist the tagging memo in the tag_memo table ("0" keeps it in memory only)
+TAG_MEMO_PERSIST = os.getenv("TAG_MEMO_PERSIST", "1") != "0"
+
+
+# Data versions whose job change log entries are kept for /jobs/changes;
+# clients synchronized to an older version must resync from 0
+CHANGE_LOG_RETAINED_VERSIONS = int(os.getenv("CHANGE_LOG_RETAINED_VERSIONS", "1000"))
+
+
+# Seconds between two recomputations of the job freshness points
+FRESHNESS_REFRESH_SECONDS = int(os.getenv("FRESHNESS_REFRESH_SECONDS", "3600"))
+freshness_task = None
+
+
+@app.on_event("startup")
+async def start_freshness_refresh():
+    """Start the periodic freshness refresh in the background."""
+    global freshness_task
+    freshness_task = asyncio.create_task(_refresh_freshness_periodically())
+
+
+async def _refresh_freshness_periodically():
+    """Recompute job freshness and compact the change log every FRESHNESS_REFRESH_SECONDS (off the event loop)."""
+    while True:
+        await asyncio.sleep(FRESHNESS_REFRESH_SECONDS)
+        try:
+            updated = await asyncio.to_thread(_refresh_freshness)
+            if updated:
+                print(f"🕒 Freshness updated for {updated} jobs")
+        except Exception as e:
+            print(f"⚠️ Freshness refresh failed: {e}")
+        try:
+            pruned = await asyncio.to_thread(_compact_change_log)
+            if pruned:
+                print(f"🧹 Pruned {pruned} job change log entries")
+        except Exception as e:
+            print(f"⚠️ Change log compaction failed: {e}")
+
+
+def _refresh_freshness() -> int:
+    """Run JobRepository.refresh_freshness in its own session."""
+    db = SessionLocal()
+    try:
+        return JobRepository(db).refresh_freshness()
+    finally:
+        db.close()
+
+
+def _compact_change_log() -> int:
+    """Run JobRepository.compact_change_log in its own session."""
+    db = SessionLocal()
+    try:
+        return JobRepository(db).compact_change_log(CHANGE_LOG_RETAINED_VERSIONS)
+    finally:
+        db.close()
+
+
+# Background re-tag of jobs tagged with outdated keyword dictionaries
+retag_task = None
+retag_progress = {
+    "running": False,
+    "processed": 0,
+    "updated": 0,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+}
+
+
+@app.on_event("startup")
+async def start_retag_on_startup():
+    """Re-tag jobs tagged with outdated keyword dictionaries in the background."""
+    _start_retag()
+
+
+def _start_retag() -> bool:
+    """Start the re-tag worker unless it is already running (requires a running event loop)."""
+    global retag_task
+    if retag_task is not None and not retag_task.done():
+        return False
+    
+    retag_progress.update(
+        running=True,
+        processed=0,
+        updated=0,
+        started_at=datetime.now(timezone.utc).isoformat(),
+        finished_at=None,
+        error=None,
+    )
+    retag_task = asyncio.create_task(_retag_outdated_jobs())
+    return True
+
+
+async def _retag_outdated_jobs():
+    """
+    Re-tag outdated jobs chunk by chunk.
+    
+    Each chunk is tagged and written in its own short transaction in a worker
+    thread, so the event loop keeps serving requests in between.
+    """
+    after_id = 0
+    try:
+        while True:
+            processed, updated, after_id = await asyncio.to_thread(_retag_chunk, after_id)
+            if after_id is None:
+                break
+            retag_progress["processed"] += processed
+            retag_progress["updated"] += updated
+        if retag_progress["processed"]:
+            print(f"🏷️ Re-tagged {retag_progress['processed']} jobs ({retag_progress['updated']} changed)")
+    except Exception as e:
+        retag_progress["error"] = str(e)
+        print(f"⚠️ Re-tag failed: {e}")
+    finally:
+        retag_progress.update(running=False, finished_at=datetime.now(timezone.utc).isoformat())
+
+
+def _retag_chunk(after_id: int) -> tuple:
+    """Run JobRepository.retag_outdated_jobs in its own session."""
+    db = SessionLocal()
+    try:
+        return JobRepository(db).retag_outdated_jobs(
+            tagging_service.tagJobs,
+            tagging_service.tagMask,
+            tagging_service.getDictionaryVersion(),
+            after_id,
+        )
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """Cancel the freshness refresh and re-tag tasks and wait until they have stopped."""
+    tasks = [task for task in (freshness_task, retag_task) if task is not None and not task.done()]
+    for task in tasks:
+        task.cancel()
+    # A chunk already handed to a worker thread still commits; the next start resumes after it
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Scoring backend: "python" (default) or "numpy" (vectorized, requires NumPy)
+SCORING_BACKEND = os.getenv("SCORING_BACKEND", "python")
+
+
+def _create_scoring_engine(tag_vocabulary):
+    """Create the scoring engine selected by SCORING_BACKEND."""
+    if SCORING_BACKEND == "numpy":
+        if NUMPY_AVAILABLE:
+            return VectorizedScoringEngine(tag_vocabulary=tag_vocabulary)
+        print("⚠️ SCORING_BACKEND=numpy but NumPy is not installed, using the Python scoring engine")
+    return ScoringEngine(tag_vocabulary=tag_vocabulary)
+
+
 # Initialize services
 tagging_service = TaggingService()
-scoring_engine = ScoringEngine()
+scoring_engine = _create_scoring_engine(tagging_service.getTagVocabulary())
 cv_parser = CVParser()
 maintenance_service = MaintenanceService()
+response_cache = ResponseCache(max_entries=256)
+score_cache = PersonalizedScoreCache(scoring_engine)
+
+# Rows per chunk written by the streaming export
+EXPORT_CHUNK_ROWS = 500
 
 origins = [
     "http://localhost:5173",
@@ -47,50 +248,166 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Utils removed - now using database repositories ---
+# --- Utils ---
+def _parse_modules(modules: str | None) -> list[str] | None:
+    """Split the comma-separated `modules` query parameter into module names."""
+    if not modules:
+        return None
+    return [name.strip().lower() for name in modules.split(",") if name.strip()]
+
+
+def _parse_fields(fields: str | None, allowed: tuple) -> list[str] | None:
+    """
+    Split the comma-separated `fields` query parameter (sparse fieldset).
+    
+    The "id" field is always included so clients can address the items.
+    
+    Raises:
+        HTTPException: If a requested field is unknown
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}",
+        )
+    return sorted(set(requested) | {"id"})
+
+
+def _modules_key(modules: str | None) -> tuple:
+    """Normalize the `modules` query parameter into a hashable cache key part."""
+    return tuple(sorted(set(_parse_modules(modules) or [])))
+
+
+def _parse_near(db: Session, near: str | None, radius_km: float | None) -> tuple | None:
+    """
+    Resolve the `near` / `radius_km` query parameters into a radius filter.
+    
+    Returns:
+        Tuple of (latitude, longitude, radius_km), or None without a radius
+        
+    Raises:
+        HTTPException: If the radius has no center or the center is not in the gazetteer
+    """
+    if radius_km is None:
+        if near:
+            raise HTTPException(status_code=400, detail="near requires radius_km")
+        return None
+    if not near:
+        raise HTTPException(status_code=400, detail="radius_km requires near")
+    
+    coordinates = LocationRepository(db).locate(near)
+    if coordinates is None:
+        raise HTTPException(status_code=400, detail=f"Unknown location: {near}")
+    return coordinates[0], coordinates[1], radius_km
+
+
+def _serve_cached(request: Request, db: Session, cache_key: tuple, build_payload) -> Response:
+    """
+    Serve a listing response through the ETag check and the response cache.
+    
+    Args:
+        request: Incoming request (for ETag computation and If-None-Match)
+        db: Database session
+        cache_key: Normalized query parameters identifying the response
+        build_payload: Callable building the response payload on a cache miss
+        
+    Returns:
+        304 response, cached body, or freshly built and cached body
+    """
+    version = VersionRepository(db).get_version()
+    etag = compute_etag(version, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Bodies are cached already compressed, once per accepted encoding
+    accepted_encoding = negotiate_encoding(request)
+    cache_key = cache_key + (accepted_encoding,)
+    
+    cached = response_cache.get(version, cache_key)
+    if cached is None:
+        body = dumps(build_payload())
+        encoding = accepted_encoding if len(body) >= COMPRESSION_MIN_BYTES else None
+        cached = (encode_body(body, encoding), encoding)
+        response_cache.put(version, cache_key, *cached)
+    
+    body, encoding = cached
+    response = json_body_response(body, encoding)
+    set_etag(response, etag)
+    return response
 
 
 # --- Routes ---
-@app.get("/jobs")
+@app.get("/jobs", response_class=FastJSONResponse)
 def get_jobs(
+    request: Request,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     modules: str = Query(None),
     search: str = Query(None),
+    cursor: str = Query(None),
+    fields: str = Query(None),
+    near: str = Query(None),
+    radius_km: float = Query(None, gt=0),
     db: Session = Depends(get_db),
 ):
+    selected_fields = _parse_fields(fields, Job.FIELDS)
+    near_filter = _parse_near(db, near, radius_km)
+    cache_key = (
+        "jobs", page, size, _modules_key(modules), search.lower() if search else None, cursor,
+        tuple(selected_fields or ()), near_filter,
+    )
+    return _serve_cached(
+        request, db, cache_key,
+        lambda: _build_jobs_page(db, page, size, modules, search, cursor, selected_fields, near_filter),
+    )
+
+
+def _build_jobs_page(
+    db: Session,
+    page: int,
+    size: int,
+    modules: str | None,
+    search: str | None,
+    cursor: str | None,
+    fields: list[str] | None,
+    near: tuple | None = None,
+) -> dict:
+    """Build the /jobs response payload (see get_jobs)."""
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+            if not isinstance(after[-1], int):
+                raise ValueError("Invalid cursor: unexpected sort key type")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     job_repo = JobRepository(db)
-    all_jobs = [job.to_dict() for job in job_repo.get_all_jobs()]
-
-    filterable_modules = sorted(list(set(job.get("module") for job in all_jobs if job.get("module"))))
-
-    # Filter by modules
-    filtered_jobs = all_jobs
-    if modules:
-        selected_modules = {name.strip().lower() for name in modules.split(",")}
-        filtered_jobs = [
-            job for job in filtered_jobs
-            if job.get("module") and job["module"].lower() in selected_modules
-        ]
-
-    # Filter by search
-    if search:
-        search_term = search.lower()
-        filtered_jobs = [
-            job for job in filtered_jobs
-            if search_term in str(job.get("title", "")).lower() or \
-               search_term in str(job.get("company", "")).lower() or \
-               search_term in str(job.get("location", "")).lower()
-        ]
-
-    # Pagination
-    total_items = len(filtered_jobs)
-    total_pages = math.ceil(total_items / size)
+    try:
+        # Fetch one extra row to know whether a next page exists
+        jobs, total_items, sort_keys = job_repo.query_jobs(
+            modules=_parse_modules(modules),
+            search=search,
+            limit=size + 1,
+            offset=0 if cursor else (page - 1) * size,
+            after=after,
+            fields=fields,
+            near=near,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    start_index = (page - 1) * size
-    end_index = start_index + size
+    has_more = len(jobs) > size
+    jobs = jobs[:size]
 
-    paginated_jobs = filtered_jobs[start_index:end_index]
+    total_pages = math.ceil(total_items / size)
+    paginated_jobs = [job.to_dict(fields) for job in jobs]
+    facets = job_repo.get_facets()
+    filterable_modules = [facet["name"] for facet in facets["modules"]]
 
     return {
         "page": page,
@@ -99,30 +416,272 @@ def get_jobs(
         "total_pages": total_pages,
         "jobs": paginated_jobs,
         "filterable_modules": filterable_modules,
+        "facets": facets,
+        "next_cursor": encode_cursor(sort_keys[size - 1]) if has_more else None,
     }
 
 
+@app.get("/jobs/export")
+def export_jobs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    modules: str = Query(None),
+    search: str = Query(None),
+    fields: str = Query(None),
+    near: str = Query(None),
+    radius_km: float = Query(None, gt=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream the whole (optionally filtered) job corpus as NDJSON or CSV.
+    
+    Args:
+        format: "ndjson" (one JSON object per line) or "csv"
+        modules: Comma-separated list of modules to filter by
+        search: Search term to filter jobs by title, company, or location
+        fields: Comma-separated list of job fields to export
+        near: Location the radius filter is centered on (gazetteer city)
+        radius_km: Only export jobs within this distance of `near`
+        
+    Returns:
+        Streaming response; rows are read through a server-side cursor so
+        memory stays constant regardless of table size
+        
+    Raises:
+        HTTPException: If the radius filter is incomplete or `near` is not in the gazetteer
+    """
+    selected_fields = _parse_fields(fields, Job.FIELDS)
+    near_filter = _parse_near(db, near, radius_km)
+    columns = selected_fields or list(Job.FIELDS)
+    # Keep the canonical column order
+    columns = [field for field in Job.FIELDS if field in columns]
+    
+    rows = _export_rows(format, _parse_modules(modules), search, selected_fields, columns, near_filter)
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="jobs.{format}"'},
+    )
+
+
+def _export_rows(
+    format: str,
+    modules: list[str] | None,
+    search: str | None,
+    fields: list[str] | None,
+    columns: list[str],
+    near: tuple | None = None,
+):
+    """
+    Generate export chunks for /jobs/export.
+    
+    Uses its own session because the stream outlives the request handler.
+    Rows are buffered into chunks of EXPORT_CHUNK_ROWS to keep writes large.
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(columns)
+        
+        chunk = []
+        for index, job in enumerate(JobRepository(db).iter_jobs(modules, search, fields, near), start=1):
+            job_data = job.to_dict(columns)
+            if format == "ndjson":
+                chunk.append(dumps(job_data))
+            else:
+                if "tags" in job_data:
+                    job_data["tags"] = ";".join(job_data["tags"])
+                writer.writerow([job_data[column] for column in columns])
+            
+            if index % EXPORT_CHUNK_ROWS == 0:
+                yield _flush_export_chunk(chunk, buffer)
+                chunk = []
+        
+        yield _flush_export_chunk(chunk, buffer)
+    finally:
+        db.close()
+
+
+def _flush_export_chunk(chunk: list[bytes], buffer: io.StringIO) -> bytes:
+    """Join buffered NDJSON lines or drain the CSV buffer into one chunk."""
+    if chunk:
+        return b"\n".join(chunk) + b"\n"
+    data = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+@app.get("/jobs/changes", response_class=FastJSONResponse)
+def get_job_changes(
+    request: Request,
+    since: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the jobs inserted, updated or deleted since a data version (delta sync).
+    
+    Args:
+        since: Data version the client last synchronized to (0 for everything)
+        
+    Returns:
+        The new data version, current state of upserted jobs and IDs of
+        deleted jobs. `reset` is true when the client must resync fully from
+        0: `since` is ahead of the server (e.g. the database was recreated)
+        or older than the pruned part of the change log (`compacted_version`).
+    """
+    version_repo = VersionRepository(db)
+    version = version_repo.get_version()
+    etag = compute_etag(version, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    compacted_version = version_repo.get_compacted_version()
+    if since > version or 0 < since < compacted_version:
+        payload = {
+            "since": since,
+            "version": version,
+            "reset": True,
+            "compacted_version": compacted_version,
+            "upserted": [],
+            "deleted": [],
+        }
+    else:
+        upserted_jobs, deleted_ids = JobRepository(db).get_changes_since(since)
+        payload = {
+            "since": since,
+            "version": version,
+            "reset": False,
+            "compacted_version": compacted_version,
+            "upserted": [job.to_dict() for job in upserted_jobs],
+            "deleted": deleted_ids,
+        }
+
+    response = compressed_json_response(request, payload)
+    set_etag(response, etag)
+    return response
+
+
 @app.get("/modules")
 def get_modules():
     return list(ACTIVE_SCRAPERS.keys())
 
 
+@app.get("/cache/stats")
+def get_cache_stats():
+    """
+    Get response cache counters.
+    
+    Returns:
+        Entries, capacity, hits, misses, evictions, invalidations and hit ratio
+    """
+    return response_cache.stats()
+
+
+# --- Tagging Endpoints ---
+@app.get("/tags/retag")
+def get_retag_status(db: Session = Depends(get_db)):
+    """
+    Get the progress of the background re-tag.
+    
+    Returns:
+        Current dictionary version, total and outdated job counts, and the
+        counters of the last (or running) re-tag
+    """
+    return _retag_status(db)
+
+
+@app.post("/tags/retag", status_code=202)
+async def start_retag(db: Session = Depends(get_db)):
+    """
+    Re-tag the jobs tagged with outdated keyword dictionaries in the background.
+    
+    Also runs at startup. Starting while a re-tag is running is a no-op.
+    
+    Returns:
+        Whether a re-tag was started, and the re-tag status
+    """
+    started = _start_retag()
+    return {"started": started, **_retag_status(db)}
+
+
+def _retag_status(db: Session) -> dict:
+    """Build the re-tag status payload."""
+    tag_version = tagging_service.getDictionaryVersion()
+    job_repo = JobRepository(db)
+    return {
+        "tag_version": tag_version,
+        "total_jobs": job_repo.count_jobs(),
+        "outdated_jobs": job_repo.count_outdated_tags(tag_version),
+        **retag_progress,
+    }
+
+
 # --- Profile Management Endpoints ---
+def _load_profile(db: Session, profile_id: int) -> UserProfile:
+    """
+    Load an existing profile (profiles other than the default one are created by POST /profile).
+    
+    Args:
+        db: Database session
+        profile_id: Profile ID
+    
+    Returns:
+        UserProfile instance
+    
+    Raises:
+        HTTPException: 404 if the profile doesn't exist
+    """
+    profile = ProfileRepository(db).get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return profile
+
+
+def _profile_response(profile: UserProfile) -> dict:
+    """
+    Serialize a profile for API responses.
+    
+    Only the default profile returns its Groq API key: the API is not
+    authenticated, so other profiles only tell whether a key is stored.
+    """
+    profile_data = profile.to_dict()
+    profile_data["has_groq_api_key"] = bool(profile.groq_api_key)
+    if profile.id != DEFAULT_PROFILE_ID:
+        profile_data["groq_api_key"] = None
+    return profile_data
+
+
 @app.get("/profile")
-def get_profile(db: Session = Depends(get_db)):
+def get_profile(
+    request: Request,
+    response: Response,
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
+    db: Session = Depends(get_db),
+):
     """
     Load user profile data.
     
+    Args:
+        profile_id: Profile ID (the default profile is created empty on first use)
+    
     Returns:
-        User profile containing tags, location, and groq_api_key
+        User profile containing tags, location, and groq_api_key (default profile only)
         
     Raises:
-        HTTPException: If profile cannot be loaded or is corrupted
+        HTTPException: 404 if the profile doesn't exist, or if it cannot be loaded or is corrupted
     """
+    etag = compute_etag(VersionRepository(db).get_version(), request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     try:
-        profile_repo = ProfileRepository(db)
-        profile = profile_repo.get_profile()
-        return profile.to_dict()
+        return _profile_response(_load_profile(db, profile_id))
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -130,12 +689,17 @@ def get_profile(db: Session = Depends(get_db)):
 
 
 @app.post("/profile")
-def save_profile(profile_data: dict = Body(...), db: Session = Depends(get_db)):
+def save_profile(
+    profile_data: dict = Body(...),
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
+    db: Session = Depends(get_db),
+):
     """
     Save user profile updates.
     
     Args:
-        profile_data: Dictionary containing profile fields (tags, location, groq_api_key)
+        profile_data: Dictionary containing profile fields (tags, location, radius_km, groq_api_key)
+        profile_id: Profile ID (created if it doesn't exist)
         
     Returns:
         Updated profile data
@@ -145,8 +709,8 @@ def save_profile(profile_data: dict = Body(...), db: Session = Depends(get_db)):
     """
     try:
         profile_repo = ProfileRepository(db)
-        profile = profile_repo.save_profile(profile_data)
-        return profile.to_dict()
+        profile = profile_repo.save_profile(profile_data, profile_id)
+        return _profile_response(profile)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except IOError as e:
@@ -156,29 +720,36 @@ def save_profile(profile_data: dict = Body(...), db: Session = Depends(get_db)):
 
 
 @app.delete("/profile")
-def reset_profile(db: Session = Depends(get_db)):
+def reset_profile(profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1), db: Session = Depends(get_db)):
     """
     Reset user profile to default/empty state.
     
+    Args:
+        profile_id: Profile ID
+    
     Returns:
         Default empty profile
         
     Raises:
-        HTTPException: If profile cannot be reset
+        HTTPException: 404 if the profile doesn't exist, or if it cannot be reset
     """
     try:
+        _load_profile(db, profile_id)
         profile_repo = ProfileRepository(db)
         # Create default empty profile
         default_profile = {
             "tags": [],
             "location": None,
+            "radius_km": None,
             "groq_api_key": None,
             "use_for_scraper_fix": False,
         }
         
         # Save the default profile (this will overwrite existing profile)
-        profile = profile_repo.save_profile(default_profile)
-        return profile.to_dict()
+        profile = profile_repo.save_profile(default_profile, profile_id)
+        return _profile_response(profile)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to reset profile: {str(e)}")
 
@@ -188,6 +759,7 @@ async def parse_cv(
     file: UploadFile = File(...),
     api_key: str = Form(None),
     merge_with_existing: bool = Form(True),
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
     db: Session = Depends(get_db),
 ):
     """
@@ -197,6 +769,7 @@ async def parse_cv(
         file: PDF file upload
         api_key: Groq API key for LLM analysis (optional if stored in profile)
         merge_with_existing: Whether to merge with existing profile tags
+        profile_id: ID of the profile to update
         
     Returns:
         Dictionary containing extracted tags and updated profile
@@ -208,16 +781,13 @@ async def parse_cv(
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
+    current_profile = _load_profile(db, profile_id)
+    
     # Determine API key to use
     final_api_key = api_key
     if not final_api_key or not final_api_key.strip():
         # Try to load from profile
-        try:
-            profile_repo = ProfileRepository(db)
-            profile = profile_repo.get_profile()
-            final_api_key = profile.groq_api_key
-        except Exception:
-            pass
+        final_api_key = current_profile.groq_api_key
             
     if not final_api_key or not final_api_key.strip():
         raise HTTPException(status_code=400, detail="Groq API key is required. Please enter it in Profile Manager.")
@@ -232,9 +802,7 @@ async def parse_cv(
         # Parse CV and extract tags
         extracted_tags, cv_text = cv_parser.parseCV(pdf_content, final_api_key.strip())
         
-        # Load current profile
         profile_repo = ProfileRepository(db)
-        current_profile = profile_repo.get_profile()
         
         # Merge tags if requested
         if merge_with_existing:
@@ -252,13 +820,13 @@ async def parse_cv(
         }
         
         # Save updated profile
-        updated_profile = profile_repo.save_profile(updated_profile_data)
+        updated_profile = profile_repo.save_profile(updated_profile_data, profile_id)
         
         return {
             "success": True,
             "extracted_tags": extracted_tags,
             "final_tags": final_tags,
-            "profile": updated_profile.to_dict(),
+            "profile": _profile_response(updated_profile),
             "cv_preview": cv_text[:500] + "..." if len(cv_text) > 500 else cv_text
         }
         
@@ -270,12 +838,17 @@ async def parse_cv(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@app.get("/jobs/for-you")
+@app.get("/jobs/for-you", response_class=FastJSONResponse)
 def get_personalized_jobs(
+    request: Request,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     modules: str = Query(None),
     search: str = Query(None),
+    cursor: str = Query(None),
+    fields: str = Query(None),
+    radius_km: float = Query(None, gt=0),
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
     db: Session = Depends(get_db),
 ):
     """
@@ -285,7 +858,13 @@ def get_personalized_jobs(
         page: Page number for pagination
         size: Number of jobs per page
         modules: Comma-separated list of modules to filter by
-        search: Search term to filter jobs by title, company, or location
+        search: Search term to filter jobs by title, company, or location (its
+            bm25 relevance is added to the profile score of matching jobs)
+        cursor: Opaque cursor from a previous response (takes precedence over page)
+        fields: Comma-separated list of job fields to return (sparse fieldset)
+        radius_km: Only keep jobs within this distance of the profile location
+            (overrides the profile radius)
+        profile_id: ID of the profile to personalize the feed for
         
     Returns:
         Paginated personalized jobs with match_score and matching_tags
@@ -293,11 +872,69 @@ def get_personalized_jobs(
     Raises:
         HTTPException: If profile cannot be loaded or jobs cannot be processed
     """
+    selected_fields = _parse_fields(fields, Job.FIELDS)
+    cache_key = (
+        "jobs/for-you", page, size, _modules_key(modules), search.lower() if search else None, cursor,
+        tuple(selected_fields or ()), radius_km, profile_id,
+    )
+    return _serve_cached(
+        request, db, cache_key,
+        lambda: _build_personalized_page(
+            db, page, size, modules, search, cursor, selected_fields, radius_km, profile_id,
+        ),
+    )
+
+
+def _resolve_preferences(db: Session, user_profile: dict, radius_km: float | None = None) -> None:
+    """
+    Add the resolved location preferences of a profile dictionary for scoring.
+    
+    Sets `location_ids` (places matching the preferred location, so scoring
+    compares place IDs) and, with a radius, `coordinates` of the preferred
+    location. A requested radius must be usable; a saved one is ignored while
+    the location is not in the gazetteer.
+    
+    Raises:
+        HTTPException: If `radius_km` is given and the profile location cannot be located
+    """
+    location_repo = LocationRepository(db)
+    user_profile["location_ids"] = location_repo.get_matching_ids(user_profile.get("location"))
+    
+    if radius_km is not None:
+        user_profile["radius_km"] = radius_km
+    if user_profile.get("radius_km"):
+        user_profile["coordinates"] = location_repo.locate(user_profile.get("location"))
+        if user_profile["coordinates"] is None and radius_km is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="radius_km requires a profile location listed in the gazetteer",
+            )
+
+
+def _build_personalized_page(
+    db: Session,
+    page: int,
+    size: int,
+    modules: str | None,
+    search: str | None,
+    cursor: str | None,
+    fields: list[str] | None,
+    radius_km: float | None = None,
+    profile_id: int = DEFAULT_PROFILE_ID,
+) -> dict:
+    """Build the /jobs/for-you response payload (see get_personalized_jobs)."""
+    after_key = None
+    if cursor:
+        try:
+            after_key = tuple(decode_cursor(cursor, 4))
+            if not all(isinstance(value, kind) for value, kind in zip(after_key, (int, int, str, int))):
+                raise ValueError("Invalid cursor: unexpected sort key type")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Load user profile
-        profile_repo = ProfileRepository(db)
-        user_profile_model = profile_repo.get_profile()
-        user_profile = user_profile_model.to_dict()
+        user_profile = _load_profile(db, profile_id).to_dict()
         
         # Check if user has any preferences set
         if not user_profile.get("tags") and not user_profile.get("location"):
@@ -308,46 +945,77 @@ def get_personalized_jobs(
                 "total_pages": 0,
                 "jobs": [],
                 "filterable_modules": [],
+                "facets": {"modules": [], "locations": [], "tags": []},
+                "next_cursor": None,
                 "message": "No preferences set. Please configure your profile to see personalized recommendations."
             }
         
-        # Load all jobs
+        _resolve_preferences(db, user_profile, radius_km)
+        user_geo = scoring_engine.profileGeo(user_profile)
+        
         job_repo = JobRepository(db)
-        all_jobs = [job.to_dict() for job in job_repo.get_all_jobs()]
-        
-        # Apply module filtering before scoring (same as regular /jobs endpoint)
-        filtered_jobs = all_jobs
-        if modules:
-            selected_modules = {name.strip().lower() for name in modules.split(",")}
-            filtered_jobs = [
-                job for job in filtered_jobs
-                if job.get("module") and job["module"].lower() in selected_modules
-            ]
         
-        # Apply search filtering before scoring (same as regular /jobs endpoint)
         if search:
-            search_term = search.lower()
-            filtered_jobs = [
-                job for job in filtered_jobs
-                if search_term in str(job.get("title", "")).lower() or \
-                   search_term in str(job.get("company", "")).lower() or \
-                   search_term in str(job.get("location", "")).lower()
-            ]
-        
-        # Score and filter jobs using ScoringEngine
-        scored_jobs = scoring_engine.scoreJobs(user_profile, filtered_jobs)
+            # Search results are a query-dependent subset: score only the SQL
+            # matches that can score above 0, blending in their bm25 relevance,
+            # and select the requested page with a bounded heap (sparse
+            # fieldsets still load the scoring columns)
+            load_fields = sorted(set(fields) | set(ScoringEngine.SCORING_FIELDS)) if fields else None
+            relevance = job_repo.get_search_relevance(search, modules=_parse_modules(modules))
+            candidate_jobs = (
+                dict(job.to_dict(load_fields), relevance=round(relevance.get(job.id, 0.0), 3))
+                for job in job_repo.get_candidate_jobs(
+                    user_profile.get("tags"),
+                    user_profile.get("location"),
+                    modules=_parse_modules(modules),
+                    search=search,
+                    fields=load_fields,
+                    near=user_geo,
+                )
+            )
+            # One extra job tells whether a next page exists
+            paginated_jobs, total_items = scoring_engine.scoreTopK(
+                user_profile,
+                candidate_jobs,
+                size + 1,
+                offset=0 if after_key is not None else (page - 1) * size,
+                after=after_key,
+            )
+            has_more = len(paginated_jobs) > size
+            paginated_jobs = paginated_jobs[:size]
+        else:
+            # Precomputed ranking of the whole corpus for this profile
+            scored_jobs = score_cache.get_ranking(db, profile_id, user_profile)
+            
+            # Apply the module filter in SQL, then keep the ranking order (same filter as /jobs)
+            if modules:
+                matching_ids = job_repo.get_filtered_job_ids(modules=_parse_modules(modules))
+                scored_jobs = [job for job in scored_jobs if job["id"] in matching_ids]
+            
+            total_items = len(scored_jobs)
+            if after_key is not None:
+                # Seek to the first job ranked after the cursor
+                start_index = bisect.bisect_right(scored_jobs, after_key, key=scoring_engine.sortKey)
+            else:
+                start_index = (page - 1) * size
+            end_index = start_index + size
+            
+            paginated_jobs = scored_jobs[start_index:end_index]
+            has_more = end_index < total_items
         
-        # Get filterable modules from all jobs (for UI consistency)
-        filterable_modules = sorted(list(set(job.get("module") for job in all_jobs if job.get("module"))))
+        # Get filterable modules and facet counts from all jobs (for UI consistency)
+        facets = job_repo.get_facets()
+        filterable_modules = [facet["name"] for facet in facets["modules"]]
         
         # Pagination
-        total_items = len(scored_jobs)
         total_pages = math.ceil(total_items / size) if total_items > 0 else 0
+        next_cursor = encode_cursor(scoring_engine.sortKey(paginated_jobs[-1])) if has_more and paginated_jobs else None
         
-        start_index = (page - 1) * size
-        end_index = start_index + size
-        
-        paginated_jobs = scored_jobs[start_index:end_index]
+        if fields:
+            paginated_jobs = [
+                {key: value for key, value in job.items() if key in fields or key in ("match_score", "matching_tags", "relevance")}
+                for job in paginated_jobs
+            ]
         
         return {
             "page": page,
@@ -356,46 +1024,112 @@ def get_personalized_jobs(
             "total_pages": total_pages,
             "jobs": paginated_jobs,
             "filterable_modules": filterable_modules,
+            "facets": facets,
+            "next_cursor": next_cursor,
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Profile error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.get("/jobs/digest", response_class=FastJSONResponse)
+def get_jobs_digest(size: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """
+    Get the top personalized jobs of every profile at once (e.g. for nightly digests).
+    
+    All profiles are scored in a single pass over the corpus
+    (ScoringEngine.scoreProfiles). Profiles without preferences are skipped.
+    
+    Args:
+        size: Number of jobs per profile
+        
+    Returns:
+        One {"profile_id", "jobs"} entry per profile, jobs with match_score and matching_tags
+        
+    Raises:
+        HTTPException: If profiles cannot be loaded or jobs cannot be processed
+    """
+    try:
+        user_profiles = []
+        for profile in ProfileRepository(db).get_profiles():
+            user_profile = profile.to_dict()
+            if user_profile.get("tags") or user_profile.get("location"):
+                _resolve_preferences(db, user_profile)
+                user_profiles.append(user_profile)
+        
+        rankings = []
+        if user_profiles:
+            jobs = (job.to_dict() for job in JobRepository(db).iter_jobs())
+            rankings = scoring_engine.scoreProfiles(user_profiles, jobs, size)
+        
+        return {
+            "profiles": [
+                {"profile_id": user_profile["id"], "jobs": ranking}
+                for user_profile, ranking in zip(user_profiles, rankings)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 # --- Application Tracking Endpoints ---
 @app.post("/applications")
-def track_application(job_data: dict = Body(...), db: Session = Depends(get_db)):
+def track_application(
+    job_data: dict = Body(...),
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
+    db: Session = Depends(get_db),
+):
     """
     Add a job to the application tracking list.
     
     Args:
         job_data: Dictionary containing complete job information
+        profile_id: ID of the tracking profile
         
     Returns:
         Created application with tracking metadata
         
     Raises:
-        HTTPException: If job data is invalid or tracking fails
+        HTTPException: 404 if the profile doesn't exist, or if job data is invalid or tracking fails
     """
     try:
         app_repo = ApplicationRepository(db)
-        application = app_repo.add_application(job_data)
+        _load_profile(db, profile_id)  # Applications belong to an existing profile
+        # Tags are computed here, not taken from the client, so they match the dictionary version
+        job_data["tags"] = tagging_service.tagJob(job_data.get("title", ""), job_data.get("description", ""))
+        job_data["tag_mask"] = tagging_service.tagMask(job_data["tags"])
+        job_data["tag_version"] = tagging_service.getDictionaryVersion()
+        application = app_repo.add_application(job_data, profile_id)
         return {
             "success": True,
             "data": application.to_dict()
         }
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@app.get("/applications")
-def get_tracked_applications(db: Session = Depends(get_db)):
+@app.get("/applications", response_class=FastJSONResponse)
+def get_tracked_applications(
+    request: Request,
+    fields: str = Query(None),
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieve all tracked applications sorted by last update.
+    Retrieve all tracked applications of a profile sorted by last update.
+    
+    Args:
+        fields: Comma-separated sparse fieldset; application fields and/or
+            nested job fields prefixed with "job." (e.g. "status,job.title")
+        profile_id: ID of the tracking profile
     
     Returns:
         List of tracked applications with metadata
@@ -403,25 +1137,52 @@ def get_tracked_applications(db: Session = Depends(get_db)):
     Raises:
         HTTPException: If applications cannot be retrieved
     """
+    app_fields, job_fields = None, None
+    if fields:
+        allowed = UserApplication.FIELDS + tuple(f"job.{field}" for field in Job.FIELDS)
+        selected_fields = _parse_fields(fields, allowed)
+        app_fields = {field for field in selected_fields if not field.startswith("job.")}
+        job_fields = [field.removeprefix("job.") for field in selected_fields if field.startswith("job.")] or None
+        if job_fields:
+            # Nested job fields imply the job itself (always with its ID)
+            app_fields.add("job")
+            job_fields.append("id")
+
+    etag = compute_etag(VersionRepository(db).get_version(), request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     try:
         app_repo = ApplicationRepository(db)
-        applications = app_repo.get_applications()
-        return {
+        applications = app_repo.get_applications(
+            include_job=app_fields is None or "job" in app_fields,
+            job_fields=job_fields,
+            profile_id=profile_id,
+        )
+        response = compressed_json_response(request, {
             "success": True,
-            "data": [app.to_dict() for app in applications]
-        }
+            "data": [app.to_dict(app_fields, job_fields) for app in applications]
+        })
+        set_etag(response, etag)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @app.patch("/applications/{job_id}")
-def update_application(job_id: str, updates: dict = Body(...), db: Session = Depends(get_db)):
+def update_application(
+    job_id: str,
+    updates: dict = Body(...),
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
+    db: Session = Depends(get_db),
+):
     """
     Update an existing tracked application.
     
     Args:
         job_id: Application ID to update
         updates: Dictionary containing fields to update (status, notes)
+        profile_id: ID of the tracking profile
         
     Returns:
         Updated application data
@@ -431,7 +1192,7 @@ def update_application(job_id: str, updates: dict = Body(...), db: Session = Dep
     """
     try:
         app_repo = ApplicationRepository(db)
-        application = app_repo.update_application(job_id, updates)
+        application = app_repo.update_application(job_id, updates, profile_id)
         if not application:
             raise HTTPException(status_code=404, detail=f"Application with ID {job_id} not found")
         return {
@@ -447,12 +1208,17 @@ def update_application(job_id: str, updates: dict = Body(...), db: Session = Dep
 
 
 @app.delete("/applications/{job_id}")
-def remove_application(job_id: str, db: Session = Depends(get_db)):
+def remove_application(
+    job_id: str,
+    profile_id: int = Query(DEFAULT_PROFILE_ID, ge=1),
+    db: Session = Depends(get_db),
+):
     """
     Remove an application from tracking.
     
     Args:
         job_id: Application ID to remove
+        profile_id: ID of the tracking profile
         
     Returns:
         Success status
@@ -462,7 +1228,7 @@ def remove_application(job_id: str, db: Session = Depends(get_db)):
     """
     try:
         app_repo = ApplicationRepository(db)
-        removed = app_repo.remove_application(job_id)
+        removed = app_repo.remove_application(job_id, profile_id)
         if not removed:
             raise HTTPException(status_code=404, detail=f"Application with ID {job_id} not found")
         
@@ -495,11 +1261,19 @@ async def scrape_selected_modules(modules: list[str] = Body(..., embed=True), db
     return await _scrape_modules(modules, db)
 
 
+def _add_jobs(jobs: list[dict]) -> int:
+    """Run JobRepository.add_jobs in its own session."""
+    db = SessionLocal()
+    try:
+        return JobRepository(db).add_jobs(jobs)
+    finally:
+        db.close()
+
+
 # --- ASYNC common function ---
 async def _scrape_modules(modules: list[str], db: Session):
     job_repo = JobRepository(db)
-    all_jobs = job_repo.get_all_jobs()
-    existing_links = {job.link for job in all_jobs}
+    existing_links = job_repo.get_all_links()
     
     tasks = []
     scraped_modules_names = []
@@ -518,7 +1292,7 @@ async def _scrape_modules(modules: list[str], db: Session):
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Process results
-    new_jobs_count = 0
+    new_jobs = []
     failed_scrapers = []
     
     for module, result in zip(scraped_modules_names, results):
@@ -567,28 +1341,50 @@ async def _scrape_modules(modules: list[str], db: Session):
             site_jobs = result
             for job in site_jobs:
                 if job["link"] not in existing_links:
-                    # Add tags to the job using TaggingService
-                    job_title = job.get("title", "")
-                    job_description = job.get("description", "")  # Some scrapers might have description
-                    job["tags"] = tagging_service.tagJob(job_title, job_description)
-                    
-                    job["new"] = True
-                    
-                    # Add to database
-                    job_repo.add_job(job)
-                    new_jobs_count += 1
+                    new_jobs.append(job)
                     existing_links.add(job["link"])
                 else:
                     print(f"Duplicate found: {job['link']}")
+    
+    # Tag the new jobs in one batch, off the event loop
+    job_texts = [
+        (job.get("title", ""), job.get("description", ""))  # Some scrapers might have description
+        for job in new_jobs
+    ]
+    memo_stats = {"hits": 0, "misses": 0}
+    job_tags = await asyncio.to_thread(tagging_service.tagJobs, job_texts, memo_stats)
+    if TAG_MEMO_PERSIST and job_texts:
+        TagMemoRepository(db).save(
+            (
+                (tagging_service.memoKey(title, description), tags)
+                for (title, description), tags in zip(job_texts, job_tags)
+                if title
+            ),
+            TAG_MEMO_SIZE,
+        )
+    
+    for job, tags in zip(new_jobs, job_tags):
+        job["tags"] = tags
+        job["tag_mask"] = tagging_service.tagMask(tags)
+        job["tag_version"] = tagging_service.getDictionaryVersion()
+        job["new"] = True
+    
+    # Add to database in one transaction, off the event loop
+    new_jobs_count = await asyncio.to_thread(_add_jobs, new_jobs)
 
     # Mark all existing jobs as not new (bulk operation)
     job_repo.mark_all_as_not_new()
     
     # Get total count
-    total_jobs = len(job_repo.get_all_jobs())
+    total_jobs = job_repo.count_jobs()
+    memo_lookups = memo_stats["hits"] + memo_stats["misses"]
 
     return {
         "added": new_jobs_count,
         "total": total_jobs,
         "failed_scrapers": failed_scrapers,
+        "tag_memo": {
+            **memo_stats,
+            "hit_ratio": round(memo_stats["hits"] / memo_lookups, 3) if memo_lookups else None,
+        },
     }
\ No newline at end of file
@@ -5,9 +5,15 @@ This module defines the database schema using SQLAlchemy ORM:
 - Job: Job postings from various scrapers
 - UserProfile: User preferences and settings (singleton)
 - UserApplication: User's tracked job applications
+- JobFacet: Materialized per-value job counts (modules, locations, tags)
+- JobTag: Normalized job/tag pairs (tag lookups without scanning JSON)
+- Location: Canonical place hierarchy (country > region > department > city)
+- DataVersion: Monotonic counter bumped on every data write (singleton)
+- JobChange: Change log of job inserts, updates and deletes per data version
+- TagMemo: Persisted tagging results keyed by normalized job text hash
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, Float, String, Boolean, DateTime, Text, ForeignKey, JSON, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -32,21 +38,42 @@ class Job(Base):
     """
     __tablename__ = "jobs"
     
+    # Fields exposed by to_dict (selectable through sparse fieldsets)
+    FIELDS = (
+        "id", "link", "module", "company", "title", "location", "location_id", "latitude", "longitude",
+        "tags", "tag_mask", "new", "freshness",
+    )
+    
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     link = Column(String, unique=True, nullable=False, index=True)
     module = Column(String, nullable=False, index=True)  # Scraper source (e.g., "airbus", "cnes")
     company = Column(String, nullable=False)
     title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)  # Text tagged along with the title ("" if none, NULL if unknown: not re-tagged)
     location = Column(String, nullable=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=True, index=True)  # Resolved canonical place
+    latitude = Column(Float, nullable=True, index=True)  # City coordinates from the gazetteer (radius filters)
+    longitude = Column(Float, nullable=True, index=True)
     tags = Column(JSON, nullable=False, default=list)  # List of tags as JSON array
+    tag_mask = Column(Integer, nullable=True)  # Tags as a bitmask over the tag vocabulary (NULL if not encodable)
+    tag_version = Column(String, nullable=True, index=True)  # TaggingService dictionary version of the tags (NULL if unknown)
     new = Column(Boolean, nullable=False, default=True)  # Flag for newly scraped jobs
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    freshness = Column(Integer, nullable=True, index=True)  # Recency points from the job age (see JobRepository.refresh_freshness)
     
     # Relationship to applications
     applications = relationship("UserApplication", back_populates="job", cascade="all, delete-orphan")
     
-    def to_dict(self):
-        """Convert model to dictionary for API responses."""
+    def to_dict(self, fields=None):
+        """
+        Convert model to dictionary for API responses.
+        
+        Args:
+            fields: Optional iterable of field names to include (all fields if None)
+        """
+        if fields is not None:
+            return {field: self._field_value(field) for field in self.FIELDS if field in fields}
+        
         return {
             "id": self.id,
             "link": self.link,
@@ -54,23 +81,35 @@ class Job(Base):
             "company": self.company,
             "title": self.title,
             "location": self.location,
+            "location_id": self.location_id,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "tags": self.tags or [],
+            "tag_mask": self.tag_mask,
             "new": self.new,
+            "freshness": self.freshness,
         }
+    
+    def _field_value(self, field):
+        """Serialized value of a single field (see to_dict)."""
+        if field == "tags":
+            return self.tags or []
+        return getattr(self, field)
 
 
 class UserProfile(Base):
     """
-    User profile model (singleton).
+    User profile model.
     
-    Stores user preferences, settings, and API keys.
-    There should only be one UserProfile record (id=1).
+    Stores user preferences, settings, and API keys, one record per user.
+    Profile 1 is the default profile, used when no profile ID is given.
     """
     __tablename__ = "user_profile"
     
-    id = Column(Integer, primary_key=True, default=1)  # Singleton - always id=1
+    id = Column(Integer, primary_key=True, default=1)
     tags = Column(JSON, nullable=False, default=list)  # User interest tags
     location = Column(String, nullable=True)  # Preferred location
+    radius_km = Column(Float, nullable=True)  # Optional search radius around the preferred location
     groq_api_key = Column(String, nullable=True)  # API key for LLM features
     use_for_scraper_fix = Column(Boolean, nullable=False, default=False)  # Enable AI diagnostics
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -78,8 +117,10 @@ class UserProfile(Base):
     def to_dict(self):
         """Convert model to dictionary for API responses."""
         return {
+            "id": self.id,
             "tags": self.tags or [],
             "location": self.location,
+            "radius_km": self.radius_km,
             "groq_api_key": self.groq_api_key,
             "use_for_scraper_fix": self.use_for_scraper_fix,
         }
@@ -94,7 +135,11 @@ class UserApplication(Base):
     """
     __tablename__ = "user_applications"
     
-    id = Column(String, primary_key=True)  # MD5 hash of job link (for compatibility)
+    # Fields exposed by to_dict (selectable through sparse fieldsets)
+    FIELDS = ("id", "profile_id", "job", "status", "date_added", "last_update", "notes")
+    
+    id = Column(String, primary_key=True)  # MD5 hash of job link, prefixed by the profile ID beyond profile 1
+    profile_id = Column(Integer, ForeignKey("user_profile.id"), nullable=False, server_default="1", index=True)
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     status = Column(SQLEnum(ApplicationStatus), nullable=False, default=ApplicationStatus.INTERESTED)
     date_added = Column(DateTime(timezone=True), nullable=False)
@@ -104,13 +149,125 @@ class UserApplication(Base):
     # Relationship to job
     job = relationship("Job", back_populates="applications")
     
-    def to_dict(self):
-        """Convert model to dictionary for API responses."""
-        return {
-            "id": self.id,
-            "job": self.job.to_dict() if self.job else None,
+    def to_dict(self, fields=None, job_fields=None):
+        """
+        Convert model to dictionary for API responses.
+        
+        Args:
+            fields: Optional iterable of field names to include (all fields if None)
+            job_fields: Optional iterable of nested job field names (all fields if None)
+        """
+        data = {"id": self.id, "profile_id": self.profile_id}
+        # Only touch the job relationship when it is requested
+        if fields is None or "job" in fields:
+            data["job"] = self.job.to_dict(job_fields) if self.job else None
+        data.update({
             "status": self.status.value if isinstance(self.status, ApplicationStatus) else self.status,
             "date_added": self.date_added.isoformat().replace('+00:00', 'Z') if self.date_added else None,
             "last_update": self.last_update.isoformat().replace('+00:00', 'Z') if self.last_update else None,
             "notes": self.notes,
+        })
+        
+        if fields is not None:
+            return {field: data[field] for field in self.FIELDS if field in fields}
+        return data
+
+
+class JobFacet(Base):
+    """
+    Materialized facet count model.
+    
+    Stores how many jobs carry a given value for a filterable dimension
+    ("module", "location" or "tag"). Maintained incrementally by
+    JobRepository so listings never scan the jobs table to build filters.
+    """
+    __tablename__ = "job_facets"
+    
+    dimension = Column(String, primary_key=True)  # "module", "location" or "tag"
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        """Convert model to dictionary for API responses."""
+        return {
+            "name": self.value,
+            "count": self.count,
         }
+
+
+class JobTag(Base):
+    """
+    Normalized job tag model.
+    
+    One row per (job, lowercase tag), mirroring Job.tags so jobs carrying a
+    tag can be found through an index. Maintained by JobRepository.
+    """
+    __tablename__ = "job_tags"
+    
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True, index=True)  # Lowercase tag
+
+
+class Location(Base):
+    """
+    Canonical place model.
+    
+    Places form a tree (country > region > department > city) resolved from
+    scraped location strings by LocationService. `path` lists the IDs from
+    the root down to the place itself ("/1/4/9/"), so descendants are found
+    with a prefix match.
+    """
+    __tablename__ = "locations"
+    __table_args__ = (UniqueConstraint("parent_id", "kind", "key"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # "country", "region", "department" or "city"
+    key = Column(String, nullable=False)  # Canonical key (normalized name, or department code)
+    parent_id = Column(Integer, ForeignKey("locations.id"), nullable=True)
+    path = Column(String, nullable=False, index=True)  # Materialized path of IDs, e.g. "/1/4/9/"
+
+
+class DataVersion(Base):
+    """
+    Data version model (singleton).
+    
+    Holds a counter that every repository write increments in the same
+    transaction. Endpoints derive ETags from it to answer unchanged requests
+    with 304 Not Modified. There should only be one record (id=1).
+    """
+    __tablename__ = "data_version"
+    
+    id = Column(Integer, primary_key=True, default=1)  # Singleton - always id=1
+    version = Column(Integer, nullable=False, default=0)
+    # Job change log entries up to this version were pruned (see JobRepository.compact_change_log)
+    compacted_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class JobChange(Base):
+    """
+    Job change log model.
+    
+    Records which job was inserted, updated or deleted at which data version,
+    so clients holding a local copy of the corpus can fetch only the delta.
+    """
+    __tablename__ = "job_changes"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    version = Column(Integer, nullable=False, index=True)  # Data version of the write
+    job_id = Column(Integer, nullable=False)  # No FK: deleted jobs keep their entries
+    operation = Column(String, nullable=False)  # "upsert" or "delete"
+
+
+class TagMemo(Base):
+    """
+    Persisted tagging memo model.
+    
+    Maps a hash of a normalized job title and description to the tags
+    TaggingService computed for it, so titles reposted after a restart skip
+    tagging. Bounded by TagMemoRepository to the most recently used entries.
+    """
+    __tablename__ = "tag_memo"
+    
+    key = Column(String, primary_key=True)  # TaggingService.memoKey digest
+    tags = Column(JSON, nullable=False, default=list)
+    used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -0,0 +1,51 @@
+"""
+Pagination helpers - Opaque cursors for keyset (seek) pagination.
+
+A cursor encodes the sort key of the last item of a page, ending with the
+job ID as a unique tiebreaker. Clients treat it as an opaque string and pass
+it back to fetch the next page.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+
+def encode_cursor(sort_key: Sequence[Any]) -> str:
+    """
+    Encode a sort key into an opaque URL-safe cursor string.
+    
+    Args:
+        sort_key: Sort key values of the last item on a page (JSON-serializable)
+        
+    Returns:
+        Opaque cursor string
+    """
+    raw = json.dumps(list(sort_key), separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, length: Optional[int] = None) -> List[Any]:
+    """
+    Decode an opaque cursor back into its sort key values.
+    
+    Args:
+        cursor: Cursor string produced by encode_cursor
+        length: Expected number of sort key values (None to accept any non-empty key)
+        
+    Returns:
+        List of sort key values
+        
+    Raises:
+        ValueError: If the cursor is malformed or does not match the expected shape
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    
+    if not isinstance(sort_key, list) or not sort_key or (length is not None and len(sort_key) != length):
+        raise ValueError("Invalid cursor: unexpected sort key shape")
+    
+    return sort_key
@@ -1,11 +1,13 @@
 """
 ApplicationRepository - Data access layer for UserApplication model.
 
-Provides methods to manage user's tracked job applications.
+Provides methods to manage the tracked job applications of each user profile.
 """
 
 from sqlalchemy.orm import Session, joinedload
 from models import UserApplication, ApplicationStatus
+from repositories.version_repository import VersionRepository
+from repositories.profile_repository import DEFAULT_PROFILE_ID
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 import hashlib
@@ -23,24 +25,30 @@ class ApplicationRepository:
         """
         self.db = db
     
-    def _generate_application_id(self, job_link: str) -> str:
+    def _generate_application_id(self, job_link: str, profile_id: int = DEFAULT_PROFILE_ID) -> str:
         """
         Generate application ID from job link (MD5 hash for compatibility).
         
+        The default profile keeps the plain hash of the link; other profiles
+        hash "<profile_id>:<link>" so each profile can track the same job.
+        
         Args:
             job_link: Job URL
+            profile_id: ID of the tracking profile
             
         Returns:
             MD5 hash string
         """
-        return hashlib.md5(job_link.encode('utf-8')).hexdigest()
+        key = job_link if profile_id == DEFAULT_PROFILE_ID else f"{profile_id}:{job_link}"
+        return hashlib.md5(key.encode('utf-8')).hexdigest()
     
-    def add_application(self, job_data: Dict[str, Any]) -> UserApplication:
+    def add_application(self, job_data: Dict[str, Any], profile_id: int = DEFAULT_PROFILE_ID) -> UserApplication:
         """
         Add a job to application tracking.
         
         Args:
             job_data: Dictionary containing job information
+            profile_id: ID of the tracking profile
             
         Returns:
             Created UserApplication instance
@@ -52,10 +60,10 @@ class ApplicationRepository:
             raise ValueError("Job must have a 'link' field")
         
         # Generate application ID
-        app_id = self._generate_application_id(job_data["link"])
+        app_id = self._generate_application_id(job_data["link"], profile_id)
         
         # Check if application already exists
-        existing_app = self.get_by_id(app_id)
+        existing_app = self.get_by_id(app_id, profile_id)
         if existing_app:
             return existing_app
         
@@ -72,6 +80,7 @@ class ApplicationRepository:
         current_time = datetime.now(timezone.utc)
         application = UserApplication(
             id=app_id,
+            profile_id=profile_id,
             job_id=job.id,
             status=ApplicationStatus.INTERESTED,
             date_added=current_time,
@@ -79,31 +88,46 @@ class ApplicationRepository:
         )
         
         self.db.add(application)
+        VersionRepository(self.db).bump()
         self.db.commit()
         self.db.refresh(application)
         
         return application
     
-    def get_applications(self) -> List[UserApplication]:
+    def get_applications(
+        self,
+        include_job: bool = True,
+        job_fields: Optional[List[str]] = None,
+        profile_id: int = DEFAULT_PROFILE_ID,
+    ) -> List[UserApplication]:
         """
-        Retrieve all tracked applications sorted by last_update.
+        Retrieve all tracked applications of a profile sorted by last_update.
         
+        Args:
+            include_job: Whether to eagerly load the related job
+            job_fields: Optional list of Job fields to load (all columns if None)
+            profile_id: ID of the tracking profile
+            
         Returns:
             List of UserApplication instances with job data loaded
         """
-        return (
-            self.db.query(UserApplication)
-            .options(joinedload(UserApplication.job))
-            .order_by(UserApplication.last_update.desc())
-            .all()
-        )
+        query = self.db.query(UserApplication).filter(UserApplication.profile_id == profile_id)
+        if include_job:
+            if job_fields is not None:
+                from repositories.job_repository import JobRepository
+                query = query.options(JobRepository.load_only_fields(job_fields, UserApplication.job))
+            else:
+                query = query.options(joinedload(UserApplication.job))
+        
+        return query.order_by(UserApplication.last_update.desc()).all()
     
-    def get_by_id(self, app_id: str) -> Optional[UserApplication]:
+    def get_by_id(self, app_id: str, profile_id: int = DEFAULT_PROFILE_ID) -> Optional[UserApplication]:
         """
-        Get a specific application by ID.
+        Get a specific application of a profile by ID.
         
         Args:
             app_id: Application ID
+            profile_id: ID of the tracking profile
             
         Returns:
             UserApplication instance if found, None otherwise
@@ -111,17 +135,23 @@ class ApplicationRepository:
         return (
             self.db.query(UserApplication)
             .options(joinedload(UserApplication.job))
-            .filter(UserApplication.id == app_id)
+            .filter(UserApplication.id == app_id, UserApplication.profile_id == profile_id)
             .first()
         )
     
-    def update_application(self, app_id: str, updates: Dict[str, Any]) -> Optional[UserApplication]:
+    def update_application(
+        self,
+        app_id: str,
+        updates: Dict[str, Any],
+        profile_id: int = DEFAULT_PROFILE_ID,
+    ) -> Optional[UserApplication]:
         """
         Update an existing application.
         
         Args:
             app_id: Application ID to update
             updates: Dictionary containing fields to update (status, notes)
+            profile_id: ID of the tracking profile
             
         Returns:
             Updated UserApplication instance if found, None otherwise
@@ -129,7 +159,7 @@ class ApplicationRepository:
         Raises:
             ValueError: If updates contain invalid data
         """
-        application = self.get_by_id(app_id)
+        application = self.get_by_id(app_id, profile_id)
         if not application:
             return None
         
@@ -151,39 +181,43 @@ class ApplicationRepository:
         
         # Update timestamp
         application.last_update = datetime.now(timezone.utc)
+        VersionRepository(self.db).bump()
         
         self.db.commit()
         self.db.refresh(application)
         
         return application
     
-    def remove_application(self, app_id: str) -> bool:
+    def remove_application(self, app_id: str, profile_id: int = DEFAULT_PROFILE_ID) -> bool:
         """
         Remove an application from tracking.
         
         Args:
             app_id: Application ID to remove
+            profile_id: ID of the tracking profile
             
         Returns:
             True if application was removed, False if not found
         """
-        application = self.get_by_id(app_id)
+        application = self.get_by_id(app_id, profile_id)
         if not application:
             return False
         
         self.db.delete(application)
+        VersionRepository(self.db).bump()
         self.db.commit()
         
         return True
     
-    def is_job_tracked(self, job_id: str) -> bool:
+    def is_job_tracked(self, job_id: str, profile_id: int = DEFAULT_PROFILE_ID) -> bool:
         """
-        Check if a job is currently being tracked.
+        Check if a job is currently being tracked by a profile.
         
         Args:
             job_id: Application ID to check
+            profile_id: ID of the tracking profile
             
         Returns:
             True if job is tracked, False otherwise
         """
-        return self.get_by_id(job_id) is not None
+        return self.get_by_id(job_id, profile_id) is not None
@@ -4,9 +4,28 @@ JobRepository - Data access layer for Job model.
 Provides methods to manage job postings in the database.
 """
 
-from sqlalchemy.orm import Session
-from models import Job
-from typing import List, Optional, Dict, Any
+from sqlalchemy import Float, Integer, and_, func, insert, or_, text, update
+from sqlalchemy.orm import Session, joinedload, load_only
+from database import JOBS_FTS_TABLE, supports_full_text_search
+from geo import EARTH_RADIUS_KM, bounding_box
+from models import Job, JobChange, JobFacet, JobTag
+from repositories.version_repository import VersionRepository
+from repositories.location_repository import LocationRepository
+from typing import List, Optional, Dict, Any, Callable, Iterator, Tuple
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import re
+
+
+# Job attributes exposed as facets, keyed by facet dimension
+FACET_DIMENSIONS = ("module", "location", "tag")
+
+# Recency decay as (maximum age in days, freshness points), youngest first;
+# older jobs get 0. Roughly halves every week.
+FRESHNESS_BUCKETS = ((1, 5), (3, 4), (7, 3), (14, 2), (30, 1))
+
+# Jobs re-tagged per transaction by retag_outdated_jobs
+RETAG_CHUNK_SIZE = 500
 
 
 class JobRepository:
@@ -40,21 +59,73 @@ class JobRepository:
             # Return existing job (idempotent)
             return existing_job
         
-        # Create new job
+        job = self._new_job(job_data)
+        self.db.add(job)
+        self.db.flush()  # Assign the job ID for the change log
+        self._apply_facet_deltas(self._facet_values(job), +1)
+        self._sync_job_tags(job.id, set(), self._tag_values(job.tags))
+        self._record_changes([job.id], "upsert")
+        self.db.commit()
+        self.db.refresh(job)
+        
+        return job
+    
+    def add_jobs(self, jobs_data: List[Dict[str, Any]]) -> int:
+        """
+        Add a batch of new jobs in a single transaction.
+        
+        The batch commits once and bumps the data version once, instead of
+        once per job with add_job. Jobs whose link already exists (in the
+        database or earlier in the batch) are skipped.
+        
+        Args:
+            jobs_data: List of dictionaries containing job information (see add_job)
+            
+        Returns:
+            Number of jobs added
+        """
+        links = {job_data["link"] for job_data in jobs_data}
+        seen_links = {link for (link,) in self.db.query(Job.link).filter(Job.link.in_(links))} if links else set()
+        
+        jobs = []
+        for job_data in jobs_data:
+            if job_data["link"] in seen_links:
+                continue
+            seen_links.add(job_data["link"])
+            jobs.append(self._new_job(job_data))
+        if not jobs:
+            return 0
+        
+        self.db.add_all(jobs)
+        self.db.flush()  # Assign the job IDs for the change log
+        # Deltas are summed first: facets created by this batch are not flushed yet
+        facet_counts = Counter(facet for job in jobs for facet in self._facet_values(job))
+        for facet, count in facet_counts.items():
+            self._apply_facet_deltas({facet}, count)
+        tag_rows = [{"job_id": job.id, "tag": tag} for job in jobs for tag in self._tag_values(job.tags)]
+        if tag_rows:
+            self.db.execute(insert(JobTag), tag_rows)
+        self._record_changes([job.id for job in jobs], "upsert")
+        self.db.commit()
+        
+        return len(jobs)
+    
+    def _new_job(self, job_data: Dict[str, Any]) -> Job:
+        """Create a (not yet added) Job instance from job data, with its location resolved."""
         job = Job(
             link=job_data["link"],
             module=job_data["module"],
             company=job_data["company"],
             title=job_data["title"],
+            description=job_data.get("description") or "",
             location=job_data.get("location"),
             tags=job_data.get("tags", []),
+            tag_mask=job_data.get("tag_mask"),
+            tag_version=job_data.get("tag_version"),
             new=job_data.get("new", True),
+            freshness=FRESHNESS_BUCKETS[0][1],  # Created now
         )
-        
-        self.db.add(job)
-        self.db.commit()
-        self.db.refresh(job)
-        
+        self._apply_location(job)
         return job
     
     def get_all_jobs(self) -> List[Job]:
@@ -66,6 +137,530 @@ class JobRepository:
         """
         return self.db.query(Job).all()
     
+    def get_all_links(self) -> set:
+        """
+        Retrieve the links of all jobs, without loading the jobs.
+        
+        Returns:
+            Set of job links
+        """
+        return {link for (link,) in self.db.query(Job.link)}
+    
+    @staticmethod
+    def _build_match_expression(search: str) -> Optional[str]:
+        """
+        Convert a free-text search term into an FTS5 prefix query.
+        
+        Every word becomes a quoted prefix token, and tokens are ANDed together,
+        so "soft toul" matches "Software Engineer - Toulouse".
+        
+        Args:
+            search: Raw search term
+            
+        Returns:
+            FTS5 MATCH expression, or None if the term contains no searchable words
+        """
+        tokens = re.findall(r"\w+", search.lower())
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+    
+    def _build_jobs_query(
+        self,
+        modules: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ):
+        """
+        Build a job query with module, search and radius filters applied in SQL.
+        
+        On SQLite the search term goes through the FTS5 index and the bm25
+        rank is exposed (lower is more relevant). Other databases, and search
+        terms without any word characters, fall back to substring matching.
+        
+        Args:
+            modules: Optional list of module names (case-insensitive)
+            search: Optional search term matched against title, company and location
+            near: Optional (latitude, longitude, radius_km) radius filter
+            
+        Returns:
+            Tuple of (SQLAlchemy query over Job (unordered), bm25 rank column or None)
+        """
+        query = self.db.query(Job)
+        rank_column = None
+        
+        if near is not None:
+            query = query.filter(self._within_radius(*near))
+        
+        if modules:
+            selected_modules = [name.strip().lower() for name in modules if name.strip()]
+            query = query.filter(func.lower(Job.module).in_(selected_modules))
+        
+        if search:
+            match_expression = self._build_match_expression(search)
+            if match_expression and supports_full_text_search(self.db.get_bind()):
+                matches = self._match_subquery(match_expression)
+                query = query.join(matches, matches.c.job_id == Job.id)
+                rank_column = matches.c.rank
+            else:
+                search_term = search.lower()
+                query = query.filter(or_(
+                    func.lower(Job.title).contains(search_term, autoescape=True),
+                    func.lower(Job.company).contains(search_term, autoescape=True),
+                    func.lower(Job.location).contains(search_term, autoescape=True),
+                ))
+        
+        return query, rank_column
+    
+    @staticmethod
+    def _match_subquery(match_expression: str):
+        """
+        Build the FTS5 subquery of the jobs matching an expression, with their bm25 rank.
+        
+        Title matches weigh three times as much as company and location matches.
+        
+        Args:
+            match_expression: FTS5 MATCH expression (see _build_match_expression)
+            
+        Returns:
+            Subquery with `job_id` and `rank` columns
+        """
+        return (
+            text(
+                f"SELECT rowid AS job_id, bm25({JOBS_FTS_TABLE}, 3.0, 1.0, 1.0) AS rank "
+                f"FROM {JOBS_FTS_TABLE} WHERE {JOBS_FTS_TABLE} MATCH :match_expression"
+            )
+            .bindparams(match_expression=match_expression)
+            .columns(job_id=Integer, rank=Float)
+            .subquery("job_matches")
+        )
+    
+    def get_search_relevance(self, search: str, modules: Optional[List[str]] = None) -> Dict[int, float]:
+        """
+        Get the text relevance of the jobs matching a search term.
+        
+        bm25 ranks are negative (lower is more relevant) and unbounded, so they
+        are divided by the best rank of the search: the best match gets 1.0
+        and weaker matches tend towards 0.
+        
+        Args:
+            search: Search term
+            modules: Optional list of module names to filter by
+            
+        Returns:
+            Dictionary of job ID to relevance in (0, 1], empty when the search
+            falls back to substring matching (no ranking available)
+        """
+        query, rank_column = self._build_jobs_query(modules, search)
+        if rank_column is None:
+            return {}
+        
+        ranks = query.with_entities(Job.id, rank_column).all()
+        best_rank = min((rank for _, rank in ranks), default=0.0)
+        if best_rank >= 0:
+            # Degenerate statistics (e.g. every job matches): no job stands out
+            return {job_id: 1.0 for job_id, _ in ranks}
+        return {job_id: rank / best_rank for job_id, rank in ranks}
+    
+    def _within_radius(self, latitude: float, longitude: float, radius_km: float):
+        """
+        Build the SQL condition keeping jobs within a radius of a point.
+        
+        The bounding box is checked first on the indexed coordinate columns,
+        then the exact haversine distance (the `haversine_km` function
+        registered on SQLite connections, plain SQL math elsewhere).
+        
+        Args:
+            latitude: Latitude of the center in degrees
+            longitude: Longitude of the center in degrees
+            radius_km: Radius in kilometers
+            
+        Returns:
+            SQLAlchemy boolean expression (jobs without coordinates never match)
+        """
+        min_latitude, max_latitude, min_longitude, max_longitude = bounding_box(latitude, longitude, radius_km)
+        conditions = [Job.latitude.between(min_latitude, max_latitude)]
+        if min_longitude is not None:
+            conditions.append(Job.longitude.between(min_longitude, max_longitude))
+        
+        if self.db.get_bind().dialect.name == "sqlite":
+            distance = func.haversine_km(Job.latitude, Job.longitude, latitude, longitude)
+        else:
+            distance = 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(
+                func.power(func.sin(func.radians(Job.latitude - latitude) / 2), 2)
+                + func.cos(func.radians(latitude)) * func.cos(func.radians(Job.latitude))
+                * func.power(func.sin(func.radians(Job.longitude - longitude) / 2), 2)
+            ))
+        conditions.append(distance <= radius_km)
+        return and_(*conditions)
+    
+    def query_jobs(
+        self,
+        modules: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[Tuple] = None,
+        fields: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> Tuple[List[Job], int, List[Tuple]]:
+        """
+        Retrieve a filtered page of jobs together with the total match count.
+        
+        Filtering, counting and slicing all happen in SQL, so only the
+        requested page is loaded into memory. Jobs are ordered by ID, or by
+        bm25 relevance then ID when a full-text search is applied. Passing
+        `after` (the sort key of the last job of the previous page) seeks past
+        it through the index instead of skipping rows with OFFSET.
+        
+        Args:
+            modules: Optional list of module names to filter by
+            search: Optional search term
+            limit: Maximum number of jobs to return (None for no limit)
+            offset: Number of matching jobs to skip
+            after: Sort key to seek past (keyset pagination), as returned in sort_keys
+            fields: Optional list of Job fields to load (all columns if None)
+            near: Optional (latitude, longitude, radius_km) radius filter
+            
+        Returns:
+            Tuple of (jobs on the requested page, total number of matching jobs,
+            sort key of each returned job)
+            
+        Raises:
+            ValueError: If `after` does not match the ordering of this query
+        """
+        query, rank_column = self._build_jobs_query(modules, search, near)
+        total_items = query.order_by(None).count()
+        
+        if fields is not None:
+            query = query.options(self.load_only_fields(fields))
+        
+        if rank_column is not None:
+            page_query = query.add_columns(rank_column).order_by(rank_column, Job.id)
+            if after is not None:
+                if len(after) != 2:
+                    raise ValueError("Invalid cursor: expected a search ranking cursor")
+                after_rank, after_id = after
+                page_query = page_query.filter(or_(
+                    rank_column > after_rank,
+                    and_(rank_column == after_rank, Job.id > after_id),
+                ))
+        else:
+            page_query = query.order_by(Job.id)
+            if after is not None:
+                if len(after) != 1:
+                    raise ValueError("Invalid cursor: expected an ID cursor")
+                page_query = page_query.filter(Job.id > after[0])
+        
+        if offset:
+            page_query = page_query.offset(offset)
+        if limit is not None:
+            page_query = page_query.limit(limit)
+        
+        if rank_column is not None:
+            rows = page_query.all()
+            return [job for job, _ in rows], total_items, [(rank, job.id) for job, rank in rows]
+        
+        jobs = page_query.all()
+        return jobs, total_items, [(job.id,) for job in jobs]
+    
+    def get_filtered_jobs(
+        self,
+        modules: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> List[Job]:
+        """
+        Retrieve every job matching the module, search and radius filters.
+        
+        Args:
+            modules: Optional list of module names to filter by
+            search: Optional search term
+            fields: Optional list of Job fields to load (all columns if None)
+            near: Optional (latitude, longitude, radius_km) radius filter
+            
+        Returns:
+            List of matching Job instances ordered by ID
+        """
+        query, _ = self._build_jobs_query(modules, search, near)
+        if fields is not None:
+            query = query.options(self.load_only_fields(fields))
+        return query.order_by(Job.id).all()
+    
+    def get_candidate_jobs(
+        self,
+        tags: Optional[List[str]],
+        location: Optional[str],
+        modules: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> List[Job]:
+        """
+        Retrieve the jobs that can get a positive personalized score.
+        
+        A job is a candidate if it shares a tag with the profile (through the
+        job_tags index), if its location matches the profile location the way
+        ScoringEngine matches it (same canonical place, ancestor or descendant;
+        substring either way for unresolved locations), or if it is new.
+        Every other job scores 0, so scoring only candidates gives the same
+        ranking. With a radius, ScoringEngine only keeps the jobs within it,
+        so those are the candidates.
+        
+        Args:
+            tags: Profile tags
+            location: Profile location
+            modules: Optional list of module names to filter by
+            search: Optional search term
+            fields: Optional list of Job fields to load (all columns if None)
+            near: Optional (latitude, longitude, radius_km) radius of the profile
+            
+        Returns:
+            List of candidate Job instances ordered by ID
+        """
+        if near is not None:
+            return self.get_filtered_jobs(modules, search, fields, near)
+        
+        conditions = [Job.new.is_(True)]
+        
+        profile_tags = self._tag_values(tags)
+        if profile_tags:
+            conditions.append(Job.id.in_(
+                self.db.query(JobTag.job_id).filter(JobTag.tag.in_(profile_tags))
+            ))
+        
+        if location:
+            location_ids = LocationRepository(self.db).get_matching_ids(location)
+            if location_ids:
+                conditions.append(Job.location_id.in_(location_ids))
+            
+            # Jobs without a resolved place (or every job, if the preference cannot
+            # be resolved) are matched by substring in Python over the distinct
+            # locations, with the same case folding as ScoringEngine
+            location_lower = location.lower()
+            matching_locations = [
+                value for (value,) in self.db.query(JobFacet.value).filter(JobFacet.dimension == "location")
+                if location_lower in value.lower() or value.lower() in location_lower
+            ]
+            if matching_locations:
+                substring_match = Job.location.in_(matching_locations)
+                if location_ids is not None:
+                    substring_match = and_(Job.location_id.is_(None), substring_match)
+                conditions.append(substring_match)
+        
+        query, _ = self._build_jobs_query(modules, search)
+        query = query.filter(or_(*conditions))
+        if fields is not None:
+            query = query.options(self.load_only_fields(fields))
+        return query.order_by(Job.id).all()
+    
+    def get_filtered_job_ids(self, modules: Optional[List[str]] = None, search: Optional[str] = None) -> set:
+        """
+        Get the IDs of the jobs matching the module and search filters.
+        
+        Args:
+            modules: Optional list of module names to filter by
+            search: Optional search term
+            
+        Returns:
+            Set of matching job IDs
+        """
+        query, _ = self._build_jobs_query(modules, search)
+        return {job_id for (job_id,) in query.with_entities(Job.id)}
+    
+    def iter_jobs(
+        self,
+        modules: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Job]:
+        """
+        Stream every job matching the filters with a server-side cursor.
+        
+        Rows are fetched `batch_size` at a time (yield_per), so memory use
+        stays constant regardless of table size.
+        
+        Args:
+            modules: Optional list of module names to filter by
+            search: Optional search term
+            fields: Optional list of Job fields to load (all columns if None)
+            near: Optional (latitude, longitude, radius_km) radius filter
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Job instances ordered by ID
+        """
+        query, _ = self._build_jobs_query(modules, search, near)
+        if fields is not None:
+            query = query.options(self.load_only_fields(fields))
+        yield from query.order_by(Job.id).yield_per(batch_size)
+    
+    @staticmethod
+    def load_only_fields(fields: List[str], relationship=None):
+        """
+        Build a loader option restricting the SELECT to the given Job fields.
+        
+        Args:
+            fields: Job field names (see Job.FIELDS); the primary key is always loaded
+            relationship: Optional relationship attribute to apply the option through
+            
+        Returns:
+            SQLAlchemy loader option
+        """
+        columns = [getattr(Job, field) for field in Job.FIELDS if field in fields]
+        if relationship is not None:
+            return joinedload(relationship).load_only(*columns)
+        return load_only(*columns)
+    
+    def get_modules(self) -> List[str]:
+        """
+        Get the distinct module names present in the jobs table.
+        
+        Returns:
+            Sorted list of module names
+        """
+        return [facet["name"] for facet in self.get_facets()["modules"]]
+    
+    def get_facets(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get materialized facet counts for modules, locations and tags.
+        
+        Modules are sorted by name (matching the filter list in the UI);
+        locations and tags are sorted by count, most common first.
+        
+        Returns:
+            Dictionary with "modules", "locations" and "tags" lists of {name, count}
+        """
+        facets = {dimension: [] for dimension in FACET_DIMENSIONS}
+        for facet in self.db.query(JobFacet).filter(JobFacet.count > 0).all():
+            facets[facet.dimension].append(facet.to_dict())
+        
+        facets["module"].sort(key=lambda facet: facet["name"])
+        facets["location"].sort(key=lambda facet: (-facet["count"], facet["name"]))
+        facets["tag"].sort(key=lambda facet: (-facet["count"], facet["name"]))
+        
+        return {
+            "modules": facets["module"],
+            "locations": facets["location"],
+            "tags": facets["tag"],
+        }
+    
+    def rebuild_facets(self) -> None:
+        """
+        Recompute all facet counts from the jobs table.
+        
+        Used at startup so databases written by earlier versions (or edited
+        outside the repository) start from consistent counts.
+        """
+        counts = Counter()
+        for module, location, tags in self.db.query(Job.module, Job.location, Job.tags):
+            for facet_key in self._facet_values_of(module, location, tags):
+                counts[facet_key] += 1
+        
+        self.db.query(JobFacet).delete()
+        self.db.add_all(
+            JobFacet(dimension=dimension, value=value, count=count)
+            for (dimension, value), count in counts.items()
+        )
+        self.db.commit()
+    
+    @staticmethod
+    def _facet_values_of(module: Optional[str], location: Optional[str], tags: Optional[List[str]]) -> set:
+        """
+        List the (dimension, value) facet keys a job contributes to.
+        
+        Args:
+            module: Job module
+            location: Job location
+            tags: Job tags
+            
+        Returns:
+            Set of (dimension, value) tuples
+        """
+        facet_values = set()
+        if module:
+            facet_values.add(("module", module))
+        if location:
+            facet_values.add(("location", location))
+        for tag in tags or []:
+            facet_values.add(("tag", tag))
+        return facet_values
+    
+    def _facet_values(self, job: Job) -> set:
+        """Facet keys of a Job instance (see _facet_values_of)."""
+        return self._facet_values_of(job.module, job.location, job.tags)
+    
+    def _apply_facet_deltas(self, facet_values: set, delta: int) -> None:
+        """
+        Adjust facet counts within the current transaction.
+        
+        Args:
+            facet_values: Set of (dimension, value) keys to adjust
+            delta: Amount to add to each count (+1 on insert, -1 on delete)
+        """
+        for dimension, value in facet_values:
+            facet = self.db.get(JobFacet, (dimension, value))
+            if facet is None:
+                if delta > 0:
+                    self.db.add(JobFacet(dimension=dimension, value=value, count=delta))
+                continue
+            
+            facet.count += delta
+            if facet.count <= 0:
+                self.db.delete(facet)
+    
+    def rebuild_job_tags(self) -> None:
+        """
+        Recompute the job_tags table from Job.tags.
+        
+        Used at startup so databases written by earlier versions (or edited
+        outside the repository) start from a consistent tag index.
+        """
+        rows = [
+            {"job_id": job_id, "tag": tag}
+            for job_id, tags in self.db.query(Job.id, Job.tags)
+            for tag in self._tag_values(tags)
+        ]
+        self.db.query(JobTag).delete()
+        if rows:
+            self.db.execute(insert(JobTag), rows)
+        self.db.commit()
+    
+    @staticmethod
+    def _tag_values(tags: Optional[List[str]]) -> set:
+        """Normalized (lowercase) tags of a job, as stored in job_tags."""
+        return {tag.lower() for tag in tags or []}
+    
+    def _sync_job_tags(self, job_id: int, old_tags: set, new_tags: set) -> None:
+        """
+        Apply a job's tag changes to job_tags within the current transaction.
+        
+        Args:
+            job_id: Job ID
+            old_tags: Normalized tags before the write (see _tag_values)
+            new_tags: Normalized tags after the write
+        """
+        removed_tags = old_tags - new_tags
+        added_tags = new_tags - old_tags
+        if removed_tags:
+            self.db.query(JobTag).filter(
+                JobTag.job_id == job_id, JobTag.tag.in_(removed_tags)
+            ).delete(synchronize_session=False)
+        if added_tags:
+            self.db.execute(insert(JobTag), [{"job_id": job_id, "tag": tag} for tag in added_tags])
+    
+    def count_jobs(self) -> int:
+        """
+        Count all jobs in the database.
+        
+        Returns:
+            Total number of jobs
+        """
+        return self.db.query(func.count(Job.id)).scalar()
+    
     def get_job_by_link(self, link: str) -> Optional[Job]:
         """
         Find a job by its URL.
@@ -105,11 +700,26 @@ class JobRepository:
         if not job:
             return None
         
+        old_facet_values = self._facet_values(job)
+        old_tag_values = self._tag_values(job.tags)
+        
         # Update allowed fields
         for key, value in updates.items():
             if hasattr(job, key):
                 setattr(job, key, value)
         
+        # A stale tag mask would be trusted by scoring; drop it until re-encoded
+        if "tags" in updates and "tag_mask" not in updates:
+            job.tag_mask = None
+        if "location" in updates:
+            self._apply_location(job)
+        
+        new_facet_values = self._facet_values(job)
+        self._apply_facet_deltas(old_facet_values - new_facet_values, -1)
+        self._apply_facet_deltas(new_facet_values - old_facet_values, +1)
+        self._sync_job_tags(job.id, old_tag_values, self._tag_values(job.tags))
+        self._record_changes([job.id], "upsert")
+        
         self.db.commit()
         self.db.refresh(job)
         
@@ -122,11 +732,299 @@ class JobRepository:
         Returns:
             Number of jobs updated
         """
+        new_job_ids = [job_id for (job_id,) in self.db.query(Job.id).filter(Job.new)]
         result = self.db.query(Job).filter(Job.new).update({"new": False})
+        if result:
+            self._record_changes(new_job_ids, "upsert")
         self.db.commit()
         
         return result
     
+    def refresh_freshness(self, now: Optional[datetime] = None) -> int:
+        """
+        Recompute the freshness points of jobs whose age crossed a bucket boundary.
+        
+        Runs one range query per FRESHNESS_BUCKETS entry on the indexed
+        created_at column and only rewrites jobs whose stored points are
+        stale, so a periodic refresh touches a handful of rows and scoring
+        never does date arithmetic.
+        
+        Args:
+            now: Reference time (defaults to the current UTC time)
+            
+        Returns:
+            Number of jobs updated
+        """
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        
+        changed_ids = []
+        newer_bound = None
+        for max_age_days, points in FRESHNESS_BUCKETS + ((None, 0),):
+            conditions = [or_(Job.freshness.is_(None), Job.freshness != points)]
+            if newer_bound is not None:
+                conditions.append(Job.created_at <= newer_bound)
+            if max_age_days is not None:
+                newer_bound = now - timedelta(days=max_age_days)
+                conditions.append(Job.created_at > newer_bound)
+            
+            stale_ids = [job_id for (job_id,) in self.db.query(Job.id).filter(*conditions)]
+            if stale_ids:
+                self.db.query(Job).filter(*conditions).update({"freshness": points}, synchronize_session=False)
+                changed_ids.extend(stale_ids)
+        
+        if changed_ids:
+            self._record_changes(changed_ids, "upsert")
+            self.db.commit()
+        
+        return len(changed_ids)
+    
+    def get_changes_since(self, since: int) -> Tuple[List[Job], List[int]]:
+        """
+        Get the jobs inserted, updated or deleted after a data version.
+        
+        Only the latest operation per job counts: a job added then deleted
+        is reported as deleted, a job deleted then re-added as upserted.
+        `since=0` returns every job, read from the jobs table since the
+        oldest change log entries may have been pruned.
+        
+        Args:
+            since: Data version the client is synchronized to
+            
+        Returns:
+            Tuple of (current state of upserted jobs, IDs of deleted jobs)
+            
+        Raises:
+            ValueError: If the change log was compacted past `since` (the
+                caller must resync from 0)
+        """
+        if since == 0:
+            return self.db.query(Job).order_by(Job.id).all(), []
+        if since < VersionRepository(self.db).get_compacted_version():
+            raise ValueError(f"Change log compacted past version {since}, resync required")
+        
+        latest_operations = {}
+        changes = (
+            self.db.query(JobChange.job_id, JobChange.operation)
+            .filter(JobChange.version > since)
+            .order_by(JobChange.id)
+        )
+        for job_id, operation in changes:
+            latest_operations[job_id] = operation
+        
+        upserted_ids = [job_id for job_id, operation in latest_operations.items() if operation == "upsert"]
+        deleted_ids = sorted(job_id for job_id, operation in latest_operations.items() if operation == "delete")
+        
+        upserted_jobs = []
+        if upserted_ids:
+            upserted_jobs = self.db.query(Job).filter(Job.id.in_(upserted_ids)).order_by(Job.id).all()
+        
+        return upserted_jobs, deleted_ids
+    
+    def compact_change_log(self, retained_versions: int) -> int:
+        """
+        Prune the change log entries older than the last `retained_versions` data versions.
+        
+        Clients synchronized to a pruned version get a resync required
+        answer from get_changes_since instead of a partial delta.
+        
+        Args:
+            retained_versions: Number of most recent data versions whose entries are kept
+            
+        Returns:
+            Number of change log entries deleted
+        """
+        version_repo = VersionRepository(self.db)
+        compacted_version = version_repo.get_version() - retained_versions
+        if compacted_version <= version_repo.get_compacted_version():
+            return 0
+        
+        deleted = (
+            self.db.query(JobChange)
+            .filter(JobChange.version <= compacted_version)
+            .delete(synchronize_session=False)
+        )
+        version_repo.set_compacted_version(compacted_version)
+        self.db.commit()
+        return deleted
+    
+    def backfill_tag_masks(self, encode: Callable[[List[str]], Optional[int]]) -> int:
+        """
+        Compute the tag mask of jobs stored without one.
+        
+        Jobs whose tags cannot be encoded keep a NULL mask and are scored by
+        set intersection instead.
+        
+        Args:
+            encode: Function turning a tag list into a mask or None
+                (see TaggingService.tagMask)
+            
+        Returns:
+            Number of jobs updated
+        """
+        rows = self.db.query(Job.id, Job.tags).filter(Job.tag_mask.is_(None)).all()
+        updates = []
+        for job_id, tags in rows:
+            tag_mask = encode(tags or [])
+            if tag_mask is not None:
+                updates.append({"id": job_id, "tag_mask": tag_mask})
+        
+        if updates:
+            self.db.execute(update(Job), updates)
+            self._record_changes([row["id"] for row in updates], "upsert")
+            self.db.commit()
+        
+        return len(updates)
+    
+    def count_outdated_tags(self, tag_version: str) -> int:
+        """
+        Count jobs tagged with other keyword dictionaries (or unknown ones).
+        
+        Jobs stored before descriptions were kept are not counted: the text
+        their tags came from is unknown, so they are never re-tagged.
+        
+        Args:
+            tag_version: Current dictionary version (see TaggingService.getDictionaryVersion)
+            
+        Returns:
+            Number of jobs retag_outdated_jobs still has to process
+        """
+        return self.db.query(func.count(Job.id)).filter(self._outdated_tags(tag_version)).scalar()
+    
+    def retag_outdated_jobs(
+        self,
+        tag_jobs: Callable[[List[Tuple[str, str]]], List[List[str]]],
+        encode: Callable[[List[str]], Optional[int]],
+        tag_version: str,
+        after_id: int = 0,
+        limit: int = RETAG_CHUNK_SIZE,
+    ) -> Tuple[int, int, Optional[int]]:
+        """
+        Re-tag the next chunk of jobs tagged with other keyword dictionaries.
+        
+        Jobs are taken in ID order after `after_id` and written in one short
+        transaction: bulk updates of the tags, masks and versions, then the
+        facet counts, tag index and change log of the jobs whose tags changed.
+        Re-tagged jobs no longer count as outdated, so an interrupted re-tag
+        resumes where it stopped. Jobs are re-tagged from the title and
+        description they were first tagged from; jobs stored without their
+        description are skipped, as re-tagging them from the title alone would
+        drop the tags their description gave.
+        
+        Args:
+            tag_jobs: Function tagging (title, description) pairs (see TaggingService.tagJobs)
+            encode: Function turning a tag list into a mask or None (see TaggingService.tagMask)
+            tag_version: Current dictionary version
+            after_id: ID of the last job processed by the previous chunk
+            limit: Maximum number of jobs in the chunk
+            
+        Returns:
+            Tuple of (jobs re-tagged, jobs whose tags changed, ID of the last
+            job of the chunk or None if no outdated job is left after after_id)
+        """
+        rows = (
+            self.db.query(Job.id, Job.title, Job.description, Job.tags, Job.tag_mask)
+            .filter(self._outdated_tags(tag_version), Job.id > after_id)
+            .order_by(Job.id)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            return 0, 0, None
+        
+        new_tags = tag_jobs([(title, description) for _, title, description, _, _ in rows])
+        
+        changed = []
+        unchanged = []
+        facet_deltas = Counter()
+        for (job_id, _, _, old_tags, old_tag_mask), tags in zip(rows, new_tags):
+            tag_mask = encode(tags)
+            if tags == (old_tags or []) and tag_mask == old_tag_mask:
+                unchanged.append({"id": job_id, "tag_version": tag_version})
+                continue
+            
+            changed.append({"id": job_id, "tags": tags, "tag_mask": tag_mask, "tag_version": tag_version})
+            old_facet_values = self._facet_values_of(None, None, old_tags)
+            new_facet_values = self._facet_values_of(None, None, tags)
+            facet_deltas.update({facet_key: -1 for facet_key in old_facet_values - new_facet_values})
+            facet_deltas.update({facet_key: +1 for facet_key in new_facet_values - old_facet_values})
+        
+        if unchanged:
+            self.db.execute(update(Job), unchanged)
+        if changed:
+            changed_ids = [row["id"] for row in changed]
+            self.db.execute(update(Job), changed)
+            for facet_key, delta in facet_deltas.items():
+                self._apply_facet_deltas({facet_key}, delta)
+            
+            # Rewrite the tag index of the changed jobs in two statements
+            self.db.query(JobTag).filter(JobTag.job_id.in_(changed_ids)).delete(synchronize_session=False)
+            tag_rows = [{"job_id": row["id"], "tag": tag} for row in changed for tag in self._tag_values(row["tags"])]
+            if tag_rows:
+                self.db.execute(insert(JobTag), tag_rows)
+            self._record_changes(changed_ids, "upsert")
+        self.db.commit()
+        
+        return len(rows), len(changed), rows[-1][0]
+    
+    @staticmethod
+    def _outdated_tags(tag_version: str):
+        """Filter on jobs whose tags were not computed with a dictionary version and can be re-tagged."""
+        return and_(
+            Job.description.is_not(None),
+            or_(Job.tag_version.is_(None), Job.tag_version != tag_version),
+        )
+    
+    def backfill_locations(self) -> int:
+        """
+        Resolve the canonical place and coordinates of jobs stored without them.
+        
+        Returns:
+            Number of jobs updated
+        """
+        location_repo = LocationRepository(self.db)
+        rows = (
+            self.db.query(Job.id, Job.location, Job.location_id, Job.latitude, Job.longitude)
+            .filter(Job.location.isnot(None), or_(Job.location_id.is_(None), Job.latitude.is_(None)))
+            .all()
+        )
+        resolved = {}
+        updates = []
+        for job_id, location, *current in rows:
+            if location not in resolved:
+                coordinates = location_repo.locate(location) or (None, None)
+                resolved[location] = (location_repo.resolve(location), *coordinates)
+            if tuple(current) != resolved[location]:
+                location_id, latitude, longitude = resolved[location]
+                updates.append({"id": job_id, "location_id": location_id, "latitude": latitude, "longitude": longitude})
+        
+        if updates:
+            self.db.execute(update(Job), updates)
+            self._record_changes([row["id"] for row in updates], "upsert")
+        self.db.commit()
+        
+        return len(updates)
+    
+    def _apply_location(self, job: Job) -> None:
+        """Set the canonical place and coordinates of a job from its location string."""
+        location_repo = LocationRepository(self.db)
+        job.location_id = location_repo.resolve(job.location)
+        job.latitude, job.longitude = location_repo.locate(job.location) or (None, None)
+    
+    def _record_changes(self, job_ids: List[int], operation: str) -> None:
+        """
+        Bump the data version and log the changed jobs under it.
+        
+        Args:
+            job_ids: IDs of the jobs written in the current transaction
+            operation: "upsert" or "delete"
+        """
+        version = VersionRepository(self.db).bump()
+        if job_ids:
+            self.db.execute(
+                insert(JobChange),
+                [{"version": version, "job_id": job_id, "operation": operation} for job_id in job_ids],
+            )
+    
     def delete_job(self, link: str) -> bool:
         """
         Delete a job from the database.
@@ -141,6 +1039,9 @@ class JobRepository:
         if not job:
             return False
         
+        self._apply_facet_deltas(self._facet_values(job), -1)
+        self._sync_job_tags(job.id, self._tag_values(job.tags), set())
+        self._record_changes([job.id], "delete")
         self.db.delete(job)
         self.db.commit()
         
@@ -0,0 +1,99 @@
+"""
+LocationRepository - Data access layer for Location model.
+
+Resolves scraped location strings into canonical place IDs and answers
+location matching with integer ID sets instead of string comparisons.
+"""
+
+from sqlalchemy.orm import Session
+from models import Location
+from location_service import LocationService
+from typing import Optional, Set, Tuple
+
+# Location parsing only depends on the bundled reference data
+location_service = LocationService()
+
+
+class LocationRepository:
+    """Repository for Location database operations."""
+    
+    def __init__(self, db: Session):
+        """
+        Initialize LocationRepository with database session.
+        
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+    
+    def resolve(self, location: Optional[str]) -> Optional[int]:
+        """
+        Get the ID of the canonical place of a location string, creating missing places.
+        
+        Does not commit: callers resolve within their own transaction.
+        
+        Args:
+            location: Raw location string
+        
+        Returns:
+            ID of the most specific place, or None if the string has no usable content
+        """
+        node = None
+        for kind, key in location_service.parseLocation(location):
+            parent = node
+            node = self._find(parent, kind, key)
+            if node is None:
+                node = Location(kind=kind, key=key, parent_id=parent.id if parent else None, path="")
+                self.db.add(node)
+                self.db.flush()  # Assign the ID for the materialized path
+                node.path = f"{parent.path if parent else '/'}{node.id}/"
+        
+        return node.id if node else None
+    
+    def get_matching_ids(self, location: Optional[str]) -> Optional[Set[int]]:
+        """
+        Get the IDs of every place matching a location preference (read-only).
+        
+        A job matches when its place is the preferred place, one of its
+        ancestors ("France" for "Toulouse") or one of its descendants
+        ("Blagnac" for "Occitanie"). Places not stored yet match nothing, but
+        their stored ancestors still do.
+        
+        Args:
+            location: Raw location preference
+        
+        Returns:
+            Set of place IDs, or None if the string has no usable content
+        """
+        chain = location_service.parseLocation(location)
+        if not chain:
+            return None
+        
+        matching_ids = set()
+        node = None
+        for kind, key in chain:
+            node = self._find(node, kind, key)
+            if node is None:
+                return matching_ids
+            matching_ids.add(node.id)
+        
+        descendants = self.db.query(Location.id).filter(Location.path.startswith(node.path, autoescape=True))
+        matching_ids.update(location_id for (location_id,) in descendants)
+        return matching_ids
+    
+    def locate(self, location: Optional[str]) -> Optional[Tuple[float, float]]:
+        """
+        Get the gazetteer coordinates of a location string.
+        
+        Args:
+            location: Raw location string
+            
+        Returns:
+            Tuple of (latitude, longitude), or None if its city is not in the gazetteer
+        """
+        return location_service.locate(location)
+    
+    def _find(self, parent: Optional[Location], kind: str, key: str) -> Optional[Location]:
+        """Find a place by parent, kind and key."""
+        parent_filter = Location.parent_id == parent.id if parent else Location.parent_id.is_(None)
+        return self.db.query(Location).filter(parent_filter, Location.kind == kind, Location.key == key).first()
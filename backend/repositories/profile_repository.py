@@ -1,13 +1,18 @@
 """
 ProfileRepository - Data access layer for UserProfile model.
 
-Provides methods to manage user profile (singleton pattern).
+Provides methods to manage user profiles, keyed by profile ID (profile 1
+being the default one).
 """
 
 from sqlalchemy.orm import Session
 from models import UserProfile
+from repositories.version_repository import VersionRepository
 from typing import Dict, Any, List, Optional
 
+# Profile used when a request does not name one
+DEFAULT_PROFILE_ID = 1
+
 
 class ProfileRepository:
     """Repository for UserProfile database operations."""
@@ -21,107 +26,143 @@ class ProfileRepository:
         """
         self.db = db
     
-    def get_profile(self) -> UserProfile:
+    def get_profile(self, profile_id: int = DEFAULT_PROFILE_ID) -> Optional[UserProfile]:
         """
-        Get user profile (creates default if doesn't exist).
+        Get user profile (the default profile is created if it doesn't exist).
         
+        Args:
+            profile_id: Profile ID
+            
         Returns:
-            UserProfile instance
+            UserProfile instance, or None if a non-default profile doesn't exist
         """
-        profile = self.db.query(UserProfile).filter(UserProfile.id == 1).first()
+        profile = self.db.query(UserProfile).filter(UserProfile.id == profile_id).first()
         
-        if not profile:
-            # Create default profile
-            profile = UserProfile(
-                id=1,
-                tags=[],
-                location=None,
-                groq_api_key=None,
-                use_for_scraper_fix=False,
-            )
-            self.db.add(profile)
-            self.db.commit()
-            self.db.refresh(profile)
+        if not profile and profile_id == DEFAULT_PROFILE_ID:
+            profile = self._create_profile(profile_id)
         
         return profile
     
-    def save_profile(self, profile_data: Dict[str, Any]) -> UserProfile:
+    def get_profiles(self) -> List[UserProfile]:
+        """
+        Get every stored user profile.
+        
+        Returns:
+            List of UserProfile instances ordered by ID
+        """
+        return self.db.query(UserProfile).order_by(UserProfile.id).all()
+    
+    def save_profile(self, profile_data: Dict[str, Any], profile_id: int = DEFAULT_PROFILE_ID) -> UserProfile:
         """
-        Save/update user profile.
+        Save/update user profile (creates it if it doesn't exist).
         
         Args:
             profile_data: Dictionary containing profile fields
+            profile_id: Profile ID
             
         Returns:
             Updated UserProfile instance
         """
-        profile = self.get_profile()
+        profile = self.get_profile(profile_id) or self._create_profile(profile_id)
         
         # Update fields if provided
         if "tags" in profile_data:
             profile.tags = profile_data["tags"]
         if "location" in profile_data:
             profile.location = profile_data["location"]
+        if "radius_km" in profile_data:
+            radius_km = profile_data["radius_km"]
+            if radius_km is not None and (not isinstance(radius_km, (int, float)) or radius_km <= 0):
+                raise ValueError("radius_km must be a positive number")
+            profile.radius_km = radius_km
         if "groq_api_key" in profile_data:
             profile.groq_api_key = profile_data["groq_api_key"]
         if "use_for_scraper_fix" in profile_data:
             profile.use_for_scraper_fix = profile_data["use_for_scraper_fix"]
+        VersionRepository(self.db).bump()
         
         self.db.commit()
         self.db.refresh(profile)
         
         return profile
     
-    def update_tags(self, tags: List[str]) -> UserProfile:
+    def update_tags(self, tags: List[str], profile_id: int = DEFAULT_PROFILE_ID) -> UserProfile:
         """
         Update user interest tags.
         
         Args:
             tags: List of tag strings
+            profile_id: Profile ID
             
         Returns:
             Updated UserProfile instance
         """
-        profile = self.get_profile()
+        profile = self._get_existing_profile(profile_id)
         profile.tags = tags
+        VersionRepository(self.db).bump()
         
         self.db.commit()
         self.db.refresh(profile)
         
         return profile
     
-    def update_location(self, location: Optional[str]) -> UserProfile:
+    def update_location(self, location: Optional[str], profile_id: int = DEFAULT_PROFILE_ID) -> UserProfile:
         """
         Update user location preference.
         
         Args:
             location: Location string or None
+            profile_id: Profile ID
             
         Returns:
             Updated UserProfile instance
         """
-        profile = self.get_profile()
+        profile = self._get_existing_profile(profile_id)
         profile.location = location
+        VersionRepository(self.db).bump()
         
         self.db.commit()
         self.db.refresh(profile)
         
         return profile
     
-    def update_groq_api_key(self, api_key: Optional[str]) -> UserProfile:
+    def update_groq_api_key(self, api_key: Optional[str], profile_id: int = DEFAULT_PROFILE_ID) -> UserProfile:
         """
         Update Groq API key.
         
         Args:
             api_key: API key string or None
+            profile_id: Profile ID
             
         Returns:
             Updated UserProfile instance
         """
-        profile = self.get_profile()
+        profile = self._get_existing_profile(profile_id)
         profile.groq_api_key = api_key
+        VersionRepository(self.db).bump()
         
         self.db.commit()
         self.db.refresh(profile)
         
         return profile
+    
+    def _get_existing_profile(self, profile_id: int) -> UserProfile:
+        """Get a profile to update, raising ValueError if it doesn't exist."""
+        profile = self.get_profile(profile_id)
+        if not profile:
+            raise ValueError(f"Profile {profile_id} not found")
+        return profile
+    
+    def _create_profile(self, profile_id: int) -> UserProfile:
+        """Create an empty profile."""
+        profile = UserProfile(
+            id=profile_id,
+            tags=[],
+            location=None,
+            groq_api_key=None,
+            use_for_scraper_fix=False,
+        )
+        self.db.add(profile)
+        self.db.commit()
+        self.db.refresh(profile)
+        return profile
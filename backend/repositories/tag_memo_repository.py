@@ -0,0 +1,74 @@
+"""
+TagMemoRepository - Data access layer for TagMemo model.
+
+Persists the tagging memo so repeated job titles skip tagging across restarts.
+"""
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from models import TagMemo
+from typing import Iterable, List, Tuple
+from datetime import datetime, timezone
+
+
+class TagMemoRepository:
+    """Repository for TagMemo database operations."""
+    
+    def __init__(self, db: Session):
+        """
+        Initialize TagMemoRepository with database session.
+        
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+    
+    def get_recent(self, limit: int) -> List[Tuple[str, List[str]]]:
+        """
+        Get the most recently used memo entries.
+        
+        Args:
+            limit: Maximum number of entries
+        
+        Returns:
+            List of (key, tags) pairs, least recently used first
+        """
+        rows = (
+            self.db.query(TagMemo.key, TagMemo.tags)
+            .order_by(TagMemo.used_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(key, tags) for key, tags in reversed(rows)]
+    
+    def save(self, entries: Iterable[Tuple[str, List[str]]], limit: int) -> None:
+        """
+        Insert or refresh memo entries, then keep only the `limit` most recent.
+        
+        Args:
+            entries: Iterable of (key, tags) pairs
+            limit: Maximum number of entries to keep
+        """
+        now = datetime.now(timezone.utc)
+        rows = {key: {"key": key, "tags": tags, "used_at": now} for key, tags in entries}
+        if not rows:
+            return
+        
+        # Select then insert/update: upsert statements differ between database dialects
+        existing_keys = {
+            key for (key,) in self.db.query(TagMemo.key).filter(TagMemo.key.in_(list(rows)))
+        }
+        updates = [row for key, row in rows.items() if key in existing_keys]
+        inserts = [row for key, row in rows.items() if key not in existing_keys]
+        if updates:
+            self.db.execute(update(TagMemo), updates)
+        if inserts:
+            self.db.execute(insert(TagMemo), inserts)
+        
+        # Evict the least recently used entries beyond the limit
+        evicted_keys = [
+            key for (key,) in self.db.query(TagMemo.key).order_by(TagMemo.used_at.desc()).offset(limit)
+        ]
+        if evicted_keys:
+            self.db.query(TagMemo).filter(TagMemo.key.in_(evicted_keys)).delete(synchronize_session=False)
+        self.db.commit()
@@ -0,0 +1,76 @@
+"""
+VersionRepository - Data access layer for DataVersion model.
+
+Provides the monotonically increasing data version used for HTTP caching.
+"""
+
+from sqlalchemy.orm import Session
+from models import DataVersion
+
+
+class VersionRepository:
+    """Repository for DataVersion database operations."""
+    
+    def __init__(self, db: Session):
+        """
+        Initialize VersionRepository with database session.
+        
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+    
+    def get_version(self) -> int:
+        """
+        Get the current data version.
+        
+        Returns:
+            Current version (0 if nothing has been written yet)
+        """
+        version = self.db.query(DataVersion.version).filter(DataVersion.id == 1).scalar()
+        return version or 0
+    
+    def get_compacted_version(self) -> int:
+        """
+        Get the data version up to which the job change log was pruned.
+        
+        Returns:
+            Compacted version (0 if the change log was never pruned)
+        """
+        compacted_version = self.db.query(DataVersion.compacted_version).filter(DataVersion.id == 1).scalar()
+        return compacted_version or 0
+    
+    def set_compacted_version(self, compacted_version: int) -> None:
+        """
+        Record the data version up to which the job change log was pruned.
+        
+        Does not commit: callers prune and record within one transaction.
+        
+        Args:
+            compacted_version: Highest data version whose change log entries were pruned
+        """
+        self.db.query(DataVersion).filter(DataVersion.id == 1).update(
+            {DataVersion.compacted_version: compacted_version}
+        )
+    
+    def bump(self) -> int:
+        """
+        Increment the data version within the current transaction.
+        
+        Does not commit: callers bump before committing their own changes so
+        the new version becomes visible atomically with the data.
+        
+        Returns:
+            The new data version
+        """
+        updated = (
+            self.db.query(DataVersion)
+            .filter(DataVersion.id == 1)
+            .update({DataVersion.version: DataVersion.version + 1})
+        )
+        if not updated:
+            self.db.add(DataVersion(id=1, version=1))
+            self.db.flush()
+            return 1
+        
+        return self.get_version()
@@ -0,0 +1,112 @@
+"""
+ResponseCache - Bounded LRU cache of serialized listing responses.
+
+This module keeps the fully serialized (and possibly compressed) JSON bodies
+of recent listing pages, keyed by normalized query parameters. Entries are tied to the data version
+they were built at: the whole cache is dropped as soon as a newer version is
+seen, so a scrape or profile save never serves stale pages.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies for a single data version."""
+    
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize ResponseCache.
+        
+        Args:
+            max_entries: Maximum number of cached responses before evicting the least recently used
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Optional[str]]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        
+        # Counters exposed through stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, version: int, key: Hashable) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Look up a cached response body.
+        
+        Args:
+            version: Current data version
+            key: Normalized request key
+            
+        Returns:
+            Tuple of (body, content encoding) if present for this version, None otherwise
+        """
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key) if version == self._version else None
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, version: int, key: Hashable, body: bytes, encoding: Optional[str] = None) -> None:
+        """
+        Store a response body, evicting the least recently used entry if full.
+        
+        Args:
+            version: Data version the body was built at
+            key: Normalized request key
+            body: Serialized response body
+            encoding: Content encoding applied to body, if any
+        """
+        with self._lock:
+            self._sync_version(version)
+            if version != self._version:
+                # Built from an older version while a newer one was seen: don't cache
+                return
+            
+            self._entries[key] = (body, encoding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with entries, capacity, version, hits, misses, evictions,
+            invalidations and hit_ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+    
+    def _sync_version(self, version: int) -> None:
+        """Drop every entry when a newer data version is observed (lock held)."""
+        if self._version is None or version > self._version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._version = version
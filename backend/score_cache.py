@@ -0,0 +1,170 @@
+"""
+PersonalizedScoreCache - Precomputed personalized rankings for /jobs/for-you.
+
+Scores only change when the profile preferences or the job set change, so
+each profile's full ranking is computed once and kept in memory. Entries are
+keyed by profile ID and radius (a /jobs/for-you radius_km override gets its
+own entry next to the profile's own radius) and fingerprinted by the other
+preferences they were scored with, so any profile save (save_profile,
+update_tags, update_location) makes the next lookup rebuild the ranking. Job writes are applied incrementally
+from the job change log: only jobs inserted, updated or deleted since the
+cached data version are rescored (or everything, once the log was pruned past
+that version). The rankings of the least recently used
+profiles are evicted beyond `max_profiles`.
+
+Rankings are scored outside the cache-wide lock, which only guards the entry
+table: a cold or outdated ranking blocks the requests for that same ranking
+(which wait for it instead of scoring it twice), not those of other profiles.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from scoring_engine import ScoringEngine
+from repositories.job_repository import JobRepository
+from repositories.version_repository import VersionRepository
+
+
+@dataclass
+class _RankingEntry:
+    """Cached ranking of one profile."""
+    fingerprint: tuple
+    version: int
+    ranking: List[Dict[str, Any]]
+
+
+class PersonalizedScoreCache:
+    """In-memory cache of per-profile ranked job lists."""
+    
+    # Above this share of changed jobs, a full rebuild is cheaper than merging
+    REBUILD_CHANGE_RATIO = 0.25
+    
+    def __init__(self, scoring_engine: ScoringEngine, max_profiles: int = 64):
+        """
+        Initialize PersonalizedScoreCache.
+        
+        Args:
+            scoring_engine: Engine used to score and order jobs
+            max_profiles: Maximum number of cached rankings (one per profile and radius) before evicting the least recently used
+        """
+        self.scoring_engine = scoring_engine
+        self.max_profiles = max_profiles
+        self._entries: "OrderedDict[tuple, _RankingEntry]" = OrderedDict()  # (profile ID, radius) -> ranking
+        self._entry_locks: Dict[tuple, threading.Lock] = {}  # Held while one ranking is scored
+        self._corpus: Optional[Tuple[int, List[Dict[str, Any]]]] = None  # (data version, job dicts)
+        self._lock = threading.Lock()  # Guards the dictionaries above, never held while scoring
+        self._corpus_lock = threading.Lock()
+    
+    def get_ranking(self, db: Session, profile_id: int, user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the full ranked list of positively scored jobs for a profile.
+        
+        The returned list is shared with the cache and must not be mutated.
+        
+        Args:
+            db: Database session
+            profile_id: Profile the ranking belongs to
+            user_profile: Profile dictionary (tags, location, ...)
+            
+        Returns:
+            Scored jobs (with match_score and matching_tags) in ranking order
+        """
+        key = (profile_id, user_profile.get("radius_km"))
+        fingerprint = self._fingerprint(user_profile)
+        
+        with self._lock:
+            entry_lock = self._entry_locks.setdefault(key, threading.Lock())
+        
+        with entry_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            
+            version_repo = VersionRepository(db)
+            version = version_repo.get_version()
+            if entry is None or entry.fingerprint != fingerprint:
+                entry = self._build(db, user_profile, fingerprint, version)
+            elif entry.version < version_repo.get_compacted_version():
+                # The changes since the cached version were pruned from the log
+                entry = self._build(db, user_profile, fingerprint, version)
+            elif entry.version < version:
+                entry = self._refresh(db, user_profile, entry, version)
+            
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_profiles:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    self._entry_locks.pop(evicted_key, None)
+            return entry.ranking
+    
+    def invalidate(self, profile_id: Optional[int] = None) -> None:
+        """
+        Drop the cached ranking of one profile, or of every profile.
+        
+        Args:
+            profile_id: Profile to drop (None for all)
+        """
+        with self._lock:
+            if profile_id is None:
+                self._entries.clear()
+                self._corpus = None
+            else:
+                for key in [key for key in self._entries if key[0] == profile_id]:
+                    del self._entries[key]
+    
+    def _build(self, db: Session, user_profile: Dict[str, Any], fingerprint: tuple, version: int) -> _RankingEntry:
+        """Score the whole corpus (or only its candidate jobs) for a profile."""
+        if self.scoring_engine.CANDIDATE_PREFILTER:
+            user_geo = self.scoring_engine.profileGeo(user_profile)
+            candidate_jobs = JobRepository(db).get_candidate_jobs(
+                user_profile.get("tags"), user_profile.get("location"), near=user_geo
+            )
+            jobs = [job.to_dict() for job in candidate_jobs]
+        else:
+            jobs = self._corpus_jobs(db, version)
+        ranking = self.scoring_engine.scoreJobs(user_profile, jobs)
+        return _RankingEntry(fingerprint=fingerprint, version=version, ranking=ranking)
+    
+    def _refresh(self, db: Session, user_profile: Dict[str, Any], entry: _RankingEntry, version: int) -> _RankingEntry:
+        """Apply job changes logged since the cached version to a ranking."""
+        upserted_jobs, deleted_ids = JobRepository(db).get_changes_since(entry.version)
+        changed_ids = {job.id for job in upserted_jobs} | set(deleted_ids)
+        
+        if not changed_ids:
+            return _RankingEntry(fingerprint=entry.fingerprint, version=version, ranking=entry.ranking)
+        if len(changed_ids) > max(len(entry.ranking), 1) * self.REBUILD_CHANGE_RATIO:
+            return self._build(db, user_profile, entry.fingerprint, version)
+        
+        rescored = self.scoring_engine.scoreJobs(user_profile, [job.to_dict() for job in upserted_jobs])
+        ranking = [job for job in entry.ranking if job["id"] not in changed_ids] + rescored
+        # Nearly sorted input: Timsort merges the new run in linear time
+        ranking.sort(key=self.scoring_engine.sortKey)
+        
+        return _RankingEntry(fingerprint=entry.fingerprint, version=version, ranking=ranking)
+    
+    def _corpus_jobs(self, db: Session, version: int) -> List[Dict[str, Any]]:
+        """
+        Get the job dictionaries of the whole corpus at a data version.
+        
+        The snapshot is reused by every full rebuild at the same version (e.g.
+        a profile change followed by another), and stays the same list object,
+        so engines can keep derived data for it (see VectorizedScoringEngine).
+        """
+        with self._corpus_lock:
+            corpus = self._corpus
+            if corpus is None or corpus[0] != version:
+                corpus = (version, [job.to_dict() for job in JobRepository(db).get_all_jobs()])
+                with self._lock:
+                    self._corpus = corpus
+            return corpus[1]
+    
+    @staticmethod
+    def _fingerprint(user_profile: Dict[str, Any]) -> tuple:
+        """Preferences that affect scoring, except the radius (part of the entry key), as a hashable value."""
+        return (
+            tuple(sorted(tag.lower() for tag in user_profile.get("tags") or [])),
+            (user_profile.get("location") or "").lower(),
+            tuple(user_profile.get("coordinates") or ()),
+        )
@@ -5,7 +5,10 @@ This module provides functionality to score jobs based on user preferences,
 filter out irrelevant jobs, and sort results by relevance score.
 """
 
-from typing import Dict, List, Any, Optional
+import heapq
+import itertools
+from geo import haversine_km
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 
 
 class ScoringEngine:
@@ -15,10 +18,30 @@ class ScoringEngine:
     TAG_MATCH_POINTS = 10
     LOCATION_MATCH_POINTS = 5
     NEW_JOB_BONUS_POINTS = 2
+    # Extra points for a job at the center of the user radius, decreasing linearly to 0 at its edge
+    DISTANCE_MAX_POINTS = 5
+    # Extra points for the best text match of a search, proportional to the job relevance
+    TEXT_RELEVANCE_MAX_POINTS = 10
     
-    def __init__(self):
-        """Initialize ScoringEngine with default scoring parameters."""
-        pass
+    # Job fields read by the scoring and ranking logic
+    SCORING_FIELDS = ("id", "title", "location", "location_id", "latitude", "longitude", "tags", "tag_mask", "new", "freshness")
+    
+    # Whether callers should only pass candidate jobs (see JobRepository.get_candidate_jobs)
+    # instead of the whole corpus when ranking it for a profile
+    CANDIDATE_PREFILTER = True
+    
+    def __init__(self, tag_vocabulary: Optional[List[str]] = None):
+        """
+        Initialize ScoringEngine with default scoring parameters.
+        
+        Args:
+            tag_vocabulary: Optional tag vocabulary in bitmask order (see
+                TaggingService.getTagVocabulary). When given, jobs carrying a
+                tag_mask are matched with a popcount instead of set intersection.
+        """
+        self._tag_vocabulary = [tag.lower() for tag in tag_vocabulary or []]
+        self._tag_bits = {tag: 1 << bit for bit, tag in enumerate(self._tag_vocabulary)}
+        self._mask_tags: Dict[int, List[str]] = {}
     
     def scoreJobs(self, user_profile: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -44,19 +67,20 @@ class ScoringEngine:
             for job in jobs:
                 if job.get("new", False):
                     enhanced_job = job.copy()
-                    enhanced_job["match_score"] = self.NEW_JOB_BONUS_POINTS
+                    enhanced_job["match_score"] = (
+                        self.NEW_JOB_BONUS_POINTS + (job.get("freshness") or 0) + self._relevancePoints(job.get("relevance"))
+                    )
                     enhanced_job["matching_tags"] = []
                     new_jobs.append(enhanced_job)
             return self.filterAndSort(new_jobs)
         
         # Pre-process user preferences for efficiency
-        user_tags_lower = set(tag.lower() for tag in user_tags) if user_tags else set()
-        user_location_lower = user_location.lower() if user_location else None
+        context = self._profileContext(user_profile)
         
         # Score each job
         scored_jobs = []
         for job in jobs:
-            score, matching_tags = self._calculateScoreOptimized(job, user_tags_lower, user_location_lower)
+            score, matching_tags = self._calculateScoreOptimized(job, *context)
             
             if score > 0:  # Only include jobs with positive scores
                 # Create enhanced job object with scoring information
@@ -68,24 +92,385 @@ class ScoringEngine:
         # Sort by score (highest first) and return
         return self.filterAndSort(scored_jobs)
     
-    def _calculateScoreOptimized(self, job: Dict[str, Any], user_tags_lower: set, user_location_lower: Optional[str]) -> tuple[int, List[str]]:
+    def scoreTopK(
+        self,
+        user_profile: Dict[str, Any],
+        jobs: Iterable[Dict[str, Any]],
+        k: int,
+        offset: int = 0,
+        after: Optional[tuple] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Score jobs in a single streaming pass and return only one page of the ranking.
+        
+        Keeps a bounded heap of the best `offset + k` candidates instead of
+        copying and sorting every positively scored job, so a page costs
+        O(n log(offset + k)) and only the returned jobs are copied. The
+        ordering is identical to scoreJobs (see sortKey).
+        
+        Args:
+            user_profile: User profile containing tags, location, etc.
+            jobs: Iterable of job dictionaries to score
+            k: Number of jobs to return
+            offset: Number of top-ranked jobs to skip
+            after: Optional sort key of the last job of the previous page (keyset pagination)
+            
+        Returns:
+            Tuple of (page of jobs with match_score and matching_tags,
+            total number of positively scored jobs)
+        """
+        context = self._profileContext(user_profile)
+        
+        total_items = 0
+        
+        def candidates():
+            nonlocal total_items
+            for job in jobs:
+                score, matching_tags = self._calculateScoreOptimized(job, *context)
+                if score <= 0:
+                    continue
+                
+                total_items += 1
+                # Same ordering as sortKey, without building the enhanced job first
+                sort_key = (-score, -int(job.get("new", False)), job.get("title", "").lower(), job.get("id") or 0)
+                if after is not None and sort_key <= after:
+                    continue
+                yield sort_key, score, matching_tags, job
+        
+        top = heapq.nsmallest(offset + k, candidates(), key=lambda candidate: candidate[0])
+        
+        page = []
+        for _, score, matching_tags, job in top[offset:]:
+            enhanced_job = job.copy()
+            enhanced_job["match_score"] = score
+            enhanced_job["matching_tags"] = matching_tags
+            page.append(enhanced_job)
+        
+        return page, total_items
+    
+    def scoreProfiles(
+        self,
+        user_profiles: List[Dict[str, Any]],
+        jobs: Iterable[Dict[str, Any]],
+        k: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Score several profiles against the same jobs in one batch (e.g. nightly digests).
+        
+        The score of a job only depends on its tag mask, location fields, new
+        flag and bonus points, so jobs are grouped by those once and each
+        group is sorted by the rest of the sort key (title, ID) once. Each
+        profile then scores every distinct group instead of every job and
+        merges the best groups. Each ranking is identical to scoreTopK for
+        that profile.
+        
+        Args:
+            user_profiles: Profiles containing tags, location, etc.
+            jobs: Iterable of job dictionaries to score (consumed once)
+            k: Number of top-ranked jobs to keep per profile (all if None)
+            
+        Returns:
+            One list of jobs with match_score and matching_tags per profile,
+            in the order of `user_profiles`
+        """
+        groups: Dict[tuple, list] = {}
+        unmasked_jobs = []
+        for job in jobs:
+            job_tag_mask = job.get("tag_mask") if self._tag_bits else None
+            if job_tag_mask is None:
+                unmasked_jobs.append(job)
+                continue
+            signature = (
+                job_tag_mask,
+                (job.get("location_id"), job.get("location"), job.get("latitude"), job.get("longitude")),
+                bool(job.get("new", False)),
+                (job.get("freshness") or 0) + self._relevancePoints(job.get("relevance")),
+            )
+            groups.setdefault(signature, []).append(((job.get("title", "").lower(), job.get("id") or 0), job))
+        for members in groups.values():
+            members.sort(key=lambda member: member[0])
+        
+        rankings = []
+        for user_profile in user_profiles:
+            context = self._profileContext(user_profile)
+            _, user_location_lower, user_tag_mask, user_location_ids, user_geo = context
+            
+            # (sort key prefix, score, matched tags or mask, members sorted by title and ID)
+            scored_groups = []
+            location_points: Dict[tuple, Optional[int]] = {}
+            for (job_tag_mask, location_key, new, extra_points), members in groups.items():
+                if location_key not in location_points:
+                    location_points[location_key] = self._locationPoints(
+                        *location_key, user_location_lower, user_location_ids, user_geo
+                    )
+                points = location_points[location_key]
+                if points is None:
+                    continue
+                matched_mask = job_tag_mask & user_tag_mask
+                score = matched_mask.bit_count() * self.TAG_MATCH_POINTS + points
+                if new:
+                    score += self.NEW_JOB_BONUS_POINTS
+                if score > 0:
+                    score += extra_points
+                    scored_groups.append(((-score, -int(new)), score, matched_mask, members))
+            
+            for job in unmasked_jobs:
+                score, matching_tags = self._calculateScoreOptimized(job, *context)
+                if score > 0:
+                    member = ((job.get("title", "").lower(), job.get("id") or 0), job)
+                    scored_groups.append(((-score, -int(job.get("new", False))), score, matching_tags, [member]))
+            
+            scored_groups.sort(key=lambda group: group[0])
+            rankings.append(self._mergeGroups(scored_groups, k))
+        
+        return rankings
+    
+    def _mergeGroups(self, scored_groups: List[tuple], k: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Build the top `k` jobs of scored job groups (see scoreProfiles).
+        
+        Args:
+            scored_groups: Groups sorted by (-score, -new), members sorted by (title, ID)
+            k: Number of jobs to return (all if None)
+            
+        Returns:
+            List of jobs with match_score and matching_tags in ranking order
+        """
+        ranking = []
+        for _, tied_groups in itertools.groupby(scored_groups, key=lambda group: group[0]):
+            # Groups with the same score and new flag interleave by (title, ID)
+            members = heapq.merge(
+                *(
+                    zip(group_members, itertools.repeat(score), itertools.repeat(matching))
+                    for _, score, matching, group_members in tied_groups
+                ),
+                key=lambda entry: entry[0][0],
+            )
+            for (_, job), score, matching in members:
+                if k is not None and len(ranking) >= k:
+                    return ranking
+                enhanced_job = job.copy()
+                enhanced_job["match_score"] = score
+                enhanced_job["matching_tags"] = list(self._maskTags(matching)) if isinstance(matching, int) else matching
+                ranking.append(enhanced_job)
+        return ranking
+    
+    def _profileContext(self, user_profile: Dict[str, Any]) -> tuple:
+        """
+        Pre-process the preferences of a profile once for scoring.
+        
+        Args:
+            user_profile: User profile containing tags, location, etc.
+            
+        Returns:
+            Tuple of the preference arguments of _calculateScoreOptimized
+            (lowercase tags, lowercase location, tag mask, location IDs, radius)
+        """
+        user_tags = user_profile.get("tags", [])
+        user_location = user_profile.get("location")
+        user_tags_lower = set(tag.lower() for tag in user_tags) if user_tags else set()
+        user_location_lower = user_location.lower() if user_location else None
+        return (
+            user_tags_lower,
+            user_location_lower,
+            self._profileMask(user_tags_lower),
+            user_profile.get("location_ids"),
+            self.profileGeo(user_profile),
+        )
+    
+    def _profileMask(self, user_tags_lower: set) -> int:
+        """
+        Encode the user tags known to the tag vocabulary as a bitmask.
+        
+        Tags outside the vocabulary cannot appear in a job tag mask, so they
+        are simply left out.
+        
+        Args:
+            user_tags_lower: Pre-processed set of lowercase user tags
+            
+        Returns:
+            Integer bitmask (0 if no tag is part of the vocabulary)
+        """
+        mask = 0
+        for tag in user_tags_lower:
+            mask |= self._tag_bits.get(tag, 0)
+        return mask
+    
+    def _maskTags(self, mask: int) -> List[str]:
+        """
+        Decode a tag bitmask into vocabulary tags (memoized per mask).
+        
+        Args:
+            mask: Integer tag bitmask
+            
+        Returns:
+            List of lowercase tags in vocabulary order
+        """
+        tags = self._mask_tags.get(mask)
+        if tags is None:
+            tags = [tag for bit, tag in enumerate(self._tag_vocabulary) if mask >> bit & 1]
+            self._mask_tags[mask] = tags
+        return tags
+    
+    @staticmethod
+    def profileGeo(user_profile: Dict[str, Any]) -> Optional[Tuple[float, float, float]]:
+        """
+        Get the radius preference of a user profile.
+        
+        Args:
+            user_profile: User profile with optional coordinates (latitude,
+                longitude of its location) and radius_km
+            
+        Returns:
+            Tuple of (latitude, longitude, radius_km), or None if the profile
+            has no radius or no coordinates
+        """
+        coordinates = user_profile.get("coordinates")
+        radius_km = user_profile.get("radius_km")
+        if not coordinates or not radius_km:
+            return None
+        return coordinates[0], coordinates[1], radius_km
+    
+    def _distancePoints(
+        self,
+        job_latitude: Optional[float],
+        job_longitude: Optional[float],
+        user_geo: Tuple[float, float, float],
+    ) -> Optional[int]:
+        """
+        Compute the distance points of a job for a radius preference.
+        
+        Args:
+            job_latitude: Latitude of the job location (None if not in the gazetteer)
+            job_longitude: Longitude of the job location
+            user_geo: Pre-processed radius preference (see profileGeo)
+            
+        Returns:
+            Points from DISTANCE_MAX_POINTS at the center down to 0 at the edge,
+            or None if the job is outside the radius or has no coordinates
+        """
+        latitude, longitude, radius_km = user_geo
+        distance = haversine_km(job_latitude, job_longitude, latitude, longitude)
+        if distance is None or distance > radius_km:
+            return None
+        return round(self.DISTANCE_MAX_POINTS * (1 - distance / radius_km))
+    
+    def _locationPoints(
+        self,
+        job_location_id: Optional[int],
+        job_location: Optional[str],
+        job_latitude: Optional[float],
+        job_longitude: Optional[float],
+        user_location_lower: Optional[str],
+        user_location_ids: Optional[set],
+        user_geo: Optional[Tuple[float, float, float]],
+    ) -> Optional[int]:
+        """
+        Compute the location and distance points of a job location.
+        
+        Only depends on the location fields, so callers can compute it once
+        per distinct location.
+        
+        Args:
+            job_location_id: ID of the job's canonical place (None if unresolved)
+            job_location: Raw job location
+            job_latitude: Latitude of the job location
+            job_longitude: Longitude of the job location
+            user_location_lower: Pre-processed lowercase user location
+            user_location_ids: IDs of the places matching the user location (None if unresolved)
+            user_geo: Optional radius preference (see profileGeo)
+            
+        Returns:
+            Points, or None if the job is outside the radius preference
+        """
+        points = 0
+        if user_geo is not None:
+            distance_points = self._distancePoints(job_latitude, job_longitude, user_geo)
+            if distance_points is None:
+                return None
+            points += distance_points
+        if self._locationMatches(job_location_id, job_location, user_location_lower, user_location_ids):
+            points += self.LOCATION_MATCH_POINTS
+        return points
+    
+    @staticmethod
+    def _locationMatches(
+        job_location_id: Optional[int],
+        job_location: Optional[str],
+        user_location_lower: Optional[str],
+        user_location_ids: Optional[set],
+    ) -> bool:
+        """
+        Check whether a job location matches the user location.
+        
+        Resolved places are compared by ID (see LocationRepository.get_matching_ids);
+        otherwise the lowercase strings must contain one another.
+        
+        Args:
+            job_location_id: ID of the job's canonical place (None if unresolved)
+            job_location: Raw job location
+            user_location_lower: Pre-processed lowercase user location
+            user_location_ids: IDs of the places matching the user location (None if unresolved)
+            
+        Returns:
+            True if the locations match
+        """
+        if not user_location_lower or not job_location:
+            return False
+        if job_location_id is not None and user_location_ids is not None:
+            return job_location_id in user_location_ids
+        
+        job_location = job_location.lower()
+        return user_location_lower in job_location or job_location in user_location_lower
+    
+    def _calculateScoreOptimized(
+        self,
+        job: Dict[str, Any],
+        user_tags_lower: set,
+        user_location_lower: Optional[str],
+        user_tag_mask: int = 0,
+        user_location_ids: Optional[set] = None,
+        user_geo: Optional[Tuple[float, float, float]] = None,
+    ) -> tuple[int, List[str]]:
         """
         Optimized score calculation with pre-processed user preferences.
         
+        Jobs that already match the profile also get their precomputed
+        freshness points (see JobRepository.refresh_freshness) and, during a
+        search, points for their `relevance` (see JobRepository.get_search_relevance).
+        
         Args:
             job: Job dictionary containing title, location, tags, etc.
             user_tags_lower: Pre-processed set of lowercase user tags
             user_location_lower: Pre-processed lowercase user location
+            user_tag_mask: Pre-processed bitmask of the user tags (see _profileMask)
+            user_location_ids: Optional IDs of the places matching the user location
+            user_geo: Optional radius preference (see profileGeo); jobs outside
+                of it score 0
             
         Returns:
             Tuple of (score, matching_tags)
         """
-        score = 0
+        # Score based on location match and distance (jobs outside the radius are excluded)
+        location_points = self._locationPoints(
+            job.get("location_id"), job.get("location"), job.get("latitude"), job.get("longitude"),
+            user_location_lower, user_location_ids, user_geo,
+        )
+        if location_points is None:
+            return 0, []
+        score = location_points
         matching_tags = []
         
-        # Score based on tag matches
+        # Score based on tag matches: popcount of the masks when the job has one,
+        # set intersection for jobs with tags outside the vocabulary
+        job_tag_mask = job.get("tag_mask") if self._tag_bits else None
         job_tags = job.get("tags", [])
-        if job_tags and user_tags_lower:
+        if job_tag_mask is not None:
+            matched_mask = job_tag_mask & user_tag_mask
+            if matched_mask:
+                score += matched_mask.bit_count() * self.TAG_MATCH_POINTS
+                matching_tags = list(self._maskTags(matched_mask))
+        elif job_tags and user_tags_lower:
             job_tags_lower = set(tag.lower() for tag in job_tags)
             matched_tags = user_tags_lower.intersection(job_tags_lower)
             
@@ -93,18 +478,30 @@ class ScoringEngine:
                 score += len(matched_tags) * self.TAG_MATCH_POINTS
                 matching_tags = list(matched_tags)
         
-        # Score based on location match
-        if user_location_lower and job.get("location"):
-            job_location = job["location"].lower()
-            if user_location_lower in job_location or job_location in user_location_lower:
-                score += self.LOCATION_MATCH_POINTS
-        
         # Bonus for new jobs
         if job.get("new", False):
             score += self.NEW_JOB_BONUS_POINTS
         
+        # Recency and search relevance only reorder jobs that match the profile
+        if score > 0:
+            score += (job.get("freshness") or 0) + self._relevancePoints(job.get("relevance"))
+        
         return score, matching_tags
     
+    def _relevancePoints(self, relevance: Optional[float]) -> int:
+        """
+        Convert a search relevance into points.
+        
+        Args:
+            relevance: Normalized text relevance in (0, 1], or None outside of a search
+            
+        Returns:
+            Points from 0 to TEXT_RELEVANCE_MAX_POINTS
+        """
+        if not relevance:
+            return 0
+        return round(self.TEXT_RELEVANCE_MAX_POINTS * relevance)
+    
 
     
     def filterAndSort(self, scored_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -121,13 +518,27 @@ class ScoringEngine:
         filtered_jobs = [job for job in scored_jobs if job.get("match_score", 0) > 0]
         
         # Sort by match_score (descending), then by new status, then by title
-        filtered_jobs.sort(key=lambda job: (
-            -job.get("match_score", 0),  # Higher scores first
-            -int(job.get("new", False)),  # New jobs first within same score
-            job.get("title", "").lower()  # Alphabetical by title as tiebreaker
-        ))
+        filtered_jobs.sort(key=self.sortKey)
         
         return filtered_jobs
     
-
-    
+    @staticmethod
+    def sortKey(job: Dict[str, Any]) -> tuple:
+        """
+        Build the ranking sort key of a scored job.
+        
+        The job ID is the final tiebreaker so the order is total, which lets
+        the key double as a pagination cursor.
+        
+        Args:
+            job: Job dictionary with match_score field
+            
+        Returns:
+            Tuple usable as a sort key (ascending order = most relevant first)
+        """
+        return (
+            -job.get("match_score", 0),  # Higher scores first
+            -int(job.get("new", False)),  # New jobs first within same score
+            job.get("title", "").lower(),  # Alphabetical by title as tiebreaker
+            job.get("id") or 0,  # Stable order for identical titles
+        )
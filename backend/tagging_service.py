@@ -1,19 +1,44 @@
 """
 TaggingService - Automatically categorizes jobs using predefined keyword dictionaries.
 
-This module provides functionality to analyze job titles and descriptions, 
-clean text content, and assign relevant category tags based on keyword matching.
+This module provides functionality to analyze job titles and descriptions 
+and assign relevant category tags based on whole-word keyword matching.
 """
 
-import re
-from typing import Dict, List, Set
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from keyword_matcher import MATCHER_VERSION, KeywordMatcher
+
+# Batches smaller than this are tagged inline: starting worker processes costs
+# more than tagging a scrape result (a few tens of microseconds per job)
+PARALLEL_TAGGING_MIN_JOBS = 20000
+
+# Jobs sent to a worker process at a time
+TAGGING_CHUNK_SIZE = 2000
+
+# Job texts whose tags are memoized (least recently used evicted first)
+TAG_MEMO_SIZE = 10000
 
 
 class TaggingService:
     """Service for automatically tagging jobs with relevant categories."""
     
-    def __init__(self):
-        """Initialize TaggingService with predefined category dictionaries."""
+    def __init__(self, memo_size: int = TAG_MEMO_SIZE):
+        """
+        Initialize TaggingService with predefined category dictionaries.
+        
+        Args:
+            memo_size: Maximum number of memoized job texts
+        """
         self._category_keywords = {
             "aerospace": [
                 "satellite", "space", "espace", "rocket", "fusée", "aviation", "aircraft", "avion", "aeronautical",
@@ -49,97 +74,284 @@ class TaggingService:
                 "pmo", "supply chain", "achats", "procurement"
             ]
         }   
-
         
-        # Common stop words to remove during text cleaning
-        self._stop_words = {
-            "le", "la", "les", "un", "une", "des", "du", "de", "et", "ou", "mais",
-            "pour", "avec", "dans", "sur", "par", "sans", "sous", "entre", "vers",
-            "the", "a", "an", "and", "or", "but", "for", "with", "in", "on", "by",
-            "without", "under", "between", "to", "from", "at", "of", "is", "are",
-            "was", "were", "be", "been", "being", "have", "has", "had", "do", "does",
-            "did", "will", "would", "could", "should", "may", "might", "can", "must"
-        }
+        # Bit of each category in job tag masks. Categories may only be appended
+        # to the dictionary above, so masks stored in the database stay valid.
+        self._tag_bits = {category: 1 << bit for bit, category in enumerate(self._category_keywords)}
+        
+        # Every keyword compiled once into a single token trie (same category order)
+        self._keyword_matcher = KeywordMatcher(self._category_keywords)
+        
+        # Identifies the dictionaries and matching rules: jobs store the version
+        # they were tagged with, and are re-tagged when it changes
+        self._dictionary_version = hashlib.blake2b(
+            json.dumps([MATCHER_VERSION, self._category_keywords], ensure_ascii=False).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+        
+        # Tags by memo key (see memoKey), in least recently used order
+        self._memo_size = memo_size
+        self._memo: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._memo_hits = 0
+        self._memo_misses = 0
     
     def tagJob(self, job_title: str, job_description: str = "") -> List[str]:
         """
         Analyze job title and description to assign relevant category tags.
         
+        Results are memoized by normalized text (see memoKey), so a reposted
+        title skips tokenization and keyword matching.
+        
         Args:
             job_title: The job title to analyze
             job_description: Optional job description for additional context
-            
+        
         Returns:
             List of category tags that match the job content
         """
         if not job_title:
             return []
         
-        # Clean and prepare text for analysis
-        cleaned_title = self.cleanTitle(job_title)
-        cleaned_description = self.cleanTitle(job_description) if job_description else ""
+        key = self.memoKey(job_title, job_description)
+        tags = self._memoGet(key)
+        if tags is None:
+            self._countMemo(0, 1)
+            tags = self._computeTags(job_title, job_description)
+            self._memoPut(key, tags)
+        else:
+            self._countMemo(1, 0)
+        return list(tags)
+    
+    def tagJobs(self, jobs: Iterable[Tuple[str, str]], memo_stats: Optional[Dict[str, int]] = None) -> List[List[str]]:
+        """
+        Tag a batch of jobs, fanning out across worker processes for large batches.
         
-        # Combine title and description for comprehensive matching
-        combined_text = f"{cleaned_title} {cleaned_description}".strip()
+        Memoized and repeated texts are tagged once. Small batches of texts
+        left are tagged inline; large ones (a full re-tag, an imported backlog)
+        are split into chunks tagged by a process pool. Results keep the input
+        order either way.
         
-        # Find matching categories
-        matching_tags = self.matchKeywords(combined_text, self._category_keywords)
+        Args:
+            jobs: Iterable of (job_title, job_description) pairs
+            memo_stats: Optional dictionary whose "hits" and "misses" counts are
+                incremented with the memo lookups of this batch
         
-        return sorted(list(matching_tags))
+        Returns:
+            List of category tag lists, one per job in input order
+        """
+        keys = []
+        resolved = {}  # Tags by memo key
+        missing = {}  # Texts left to tag by memo key, first occurrence only
+        for title, description in jobs:
+            key = self.memoKey(title, description) if title else None
+            keys.append(key)
+            if key is None or key in resolved or key in missing:
+                continue
+            tags = self._memoGet(key)
+            if tags is None:
+                missing[key] = (title, description)
+            else:
+                resolved[key] = tags
+        
+        for key, tags in zip(missing, self._computeBatch(list(missing.values()))):
+            resolved[key] = tags
+            self._memoPut(key, tags)
+        
+        # Repeats within the batch are tagged once, so they count as hits
+        misses = len(missing)
+        hits = sum(key is not None for key in keys) - misses
+        self._countMemo(hits, misses)
+        if memo_stats is not None:
+            memo_stats["hits"] = memo_stats.get("hits", 0) + hits
+            memo_stats["misses"] = memo_stats.get("misses", 0) + misses
+        
+        return [list(resolved[key]) if key is not None else [] for key in keys]
     
-    def cleanTitle(self, text: str) -> str:
+    def memoKey(self, job_title: str, job_description: str = "") -> str:
         """
-        Clean and normalize text for keyword matching.
+        Compute the memo key of a job text.
+        
+        Case and surrounding whitespace are normalized first: tagging ignores
+        both. Cheap on purpose, since it runs on every lookup. Keys include the
+        dictionary version, so entries persisted under older dictionaries never hit.
         
         Args:
-            text: Raw text to clean
-            
+            job_title: The job title
+            job_description: Optional job description
+        
         Returns:
-            Cleaned and normalized text string
+            Hex digest identifying the normalized title and description
         """
-        if not text:
-            return ""
+        normalized = f"{self._dictionary_version}\n{job_title.strip()}\n{(job_description or '').strip()}".lower()
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def loadMemo(self, entries: Iterable[Tuple[str, List[str]]]) -> None:
+        """
+        Warm the memo with previously persisted entries.
         
-        # Convert to lowercase
-        cleaned = text.lower()
+        Args:
+            entries: Iterable of (memo key, tags) pairs, least recently used first
+        """
+        for key, tags in entries:
+            self._memoPut(key, tuple(tags))
+    
+    def getMemoStats(self) -> Dict[str, Any]:
+        """
+        Get the memo size and lookup counts since startup.
         
-        # Remove special characters and extra whitespace
-        cleaned = re.sub(r'[^\w\s]', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        Returns:
+            Dictionary with size, capacity, hits, misses and hit_ratio (None before any lookup)
+        """
+        with self._memo_lock:
+            hits, misses, size = self._memo_hits, self._memo_misses, len(self._memo)
+        return {
+            "size": size,
+            "capacity": self._memo_size,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    
+    def getDictionaryVersion(self) -> str:
+        """
+        Get the version of the keyword dictionaries and matching rules.
+        
+        Returns:
+            Short hex digest, changing whenever tags computed by tagJob may change
+        """
+        return self._dictionary_version
+    
+    def getTagVocabulary(self) -> List[str]:
+        """
+        Get the tag vocabulary in bitmask order.
         
-        # Remove stop words
-        words = cleaned.split()
-        filtered_words = [word for word in words if word not in self._stop_words and len(word) > 2]
+        Returns:
+            List of category tags; the i-th tag is bit i of a tag mask
+        """
+        return list(self._tag_bits)
+    
+    def tagMask(self, tags: List[str]) -> Optional[int]:
+        """
+        Encode tags as a bitmask over the tag vocabulary.
         
-        return ' '.join(filtered_words)
+        Args:
+            tags: List of category tags (case-insensitive)
+        
+        Returns:
+            Integer bitmask, or None if a tag is not part of the vocabulary
+        """
+        mask = 0
+        for tag in tags or []:
+            bit = self._tag_bits.get(tag.lower())
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
     
     def matchKeywords(self, text: str, categories: Dict[str, List[str]]) -> Set[str]:
         """
         Find matching categories based on keyword presence in text.
         
+        Keywords match whole words and phrases, ignoring case, accents,
+        punctuation and plural "s".
+        
         Args:
-            text: Cleaned text to analyze
+            text: Raw text to analyze
             categories: Dictionary mapping category names to keyword lists
-            
+        
         Returns:
             Set of category names that have matching keywords
         """
         if not text:
             return set()
         
-        matching_categories = set()
-        text_words = set(text.split())
+        # One lookup per token whatever the number of keywords; other
+        # dictionaries are compiled on the fly
+        if categories is self._category_keywords:
+            matcher = self._keyword_matcher
+        else:
+            matcher = KeywordMatcher(categories)
         
-        for category, keywords in categories.items():
-            # Check if any keyword from this category appears in the text
-            category_keywords = set(keyword.lower() for keyword in keywords)
-            
-            # Look for exact word matches and partial matches
-            for keyword in category_keywords:
-                if keyword in text_words or keyword in text:
-                    matching_categories.add(category)
-                    break
+        return set(matcher.match_groups(text))
+    
+    def _computeTags(self, job_title: str, job_description: str) -> Tuple[str, ...]:
+        """Tag a job text without the memo."""
+        # Combine title and description for comprehensive matching
+        combined_text = f"{job_title} {job_description or ''}"
         
-        return matching_categories
+        # Find matching categories
+        matching_tags = self.matchKeywords(combined_text, self._category_keywords)
+        
+        return tuple(sorted(matching_tags))
+    
+    def _computeBatch(self, jobs: List[Tuple[str, str]]) -> List[Tuple[str, ...]]:
+        """Tag job texts without the memo, across worker processes for large batches."""
+        worker_count = min(os.cpu_count() or 1, -(-len(jobs) // TAGGING_CHUNK_SIZE))
+        if len(jobs) < PARALLEL_TAGGING_MIN_JOBS or worker_count < 2:
+            return [self._computeTags(title, description) for title, description in jobs]
+        
+        job_iterator = iter(jobs)
+        chunks = iter(lambda: list(islice(job_iterator, TAGGING_CHUNK_SIZE)), [])
+        try:
+            # Spawned, not forked: a fork would copy the server's threads and held locks
+            with ProcessPoolExecutor(
+                max_workers=worker_count,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_tagging_worker,
+                initargs=(self,),
+            ) as pool:
+                # map yields chunk results in submission order
+                return list(chain.from_iterable(pool.map(_tag_chunk, chunks)))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Parallel tagging unavailable, tagging inline: {e}")
+            return [self._computeTags(title, description) for title, description in jobs]
+    
+    def _memoGet(self, key: str) -> Optional[Tuple[str, ...]]:
+        """Look up memoized tags, marking the entry as recently used."""
+        with self._memo_lock:
+            tags = self._memo.get(key)
+            if tags is not None:
+                self._memo.move_to_end(key)
+            return tags
     
+    def _memoPut(self, key: str, tags: Tuple[str, ...]) -> None:
+        """Memoize tags, evicting the least recently used entries beyond the memo size."""
+        with self._memo_lock:
+            self._memo[key] = tags
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+    
+    def _countMemo(self, hits: int, misses: int) -> None:
+        """Add memo lookups to the counters reported by getMemoStats."""
+        with self._memo_lock:
+            self._memo_hits += hits
+            self._memo_misses += misses
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle for worker processes, which only compute tags: no memo, no lock."""
+        state = self.__dict__.copy()
+        state["_memo"] = OrderedDict()
+        del state["_memo_lock"]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled service with a fresh lock."""
+        self.__dict__.update(state)
+        self._memo_lock = threading.Lock()
+
+
+# Tagging service of the current worker process (set by the pool initializer)
+_worker_service: Optional[TaggingService] = None
+
+
+def _init_tagging_worker(service: TaggingService) -> None:
+    """Keep the tagging service sent by the parent process."""
+    global _worker_service
+    _worker_service = service
+
 
+def _tag_chunk(jobs: List[Tuple[str, str]]) -> List[Tuple[str, ...]]:
+    """Tag a chunk of (job_title, job_description) pairs in a worker process."""
+    return [_worker_service._computeTags(title, description) for title, description in jobs]
@@ -0,0 +1,44 @@
+"""
+Tests for supports_full_text_search: FTS5 detection is cached and its absence falls back to substring search.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import database
+from models import Base
+from repositories.job_repository import JobRepository
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "_fts5_support", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)  # No FTS5 index: init_db only creates it for the app database
+    yield engine
+    engine.dispose()
+
+
+def test_fts5_detection_runs_once(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    first = database.supports_full_text_search(engine)
+    with engine.connect() as conn:
+        assert database.supports_full_text_search(conn) is first
+    assert statements == ["PRAGMA compile_options"]
+
+
+def test_search_without_fts5_matches_substrings(engine):
+    database._fts5_support[str(engine.url)] = False  # SQLite built without ENABLE_FTS5
+    db = sessionmaker(bind=engine)()
+    job_repo = JobRepository(db)
+    for index, title in enumerate(["Stage logiciel embarqué", "Stage avionique"]):
+        job_repo.add_job({"link": f"https://example.com/{index}", "module": "airbus", "company": "Airbus", "title": title})
+
+    jobs, total_items, sort_keys = job_repo.query_jobs(search="logiciel")
+    assert [job.title for job in jobs] == ["Stage logiciel embarqué"]
+    assert sort_keys == [(jobs[0].id,)]
+    assert job_repo.get_search_relevance("logiciel") == {}
+    db.close()
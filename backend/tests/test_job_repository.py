@@ -0,0 +1,109 @@
+"""
+Tests for JobRepository: batch inserts, re-tagging keeps the tags a description gave, cursor shapes are checked.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Job, JobChange, JobTag
+from repositories.job_repository import JobRepository
+from repositories.version_repository import VersionRepository
+from tagging_service import TaggingService
+
+tagging_service = TaggingService(memo_size=0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_job(job_repo, link, title, description=""):
+    tags = tagging_service.tagJob(title, description)
+    return job_repo.add_job({
+        "link": link,
+        "module": "airbus",
+        "company": "Airbus",
+        "title": title,
+        "description": description,
+        "tags": tags,
+        "tag_mask": tagging_service.tagMask(tags),
+        "tag_version": "outdated",
+    })
+
+
+def test_add_jobs_writes_the_batch_in_one_version(db):
+    job_repo = JobRepository(db)
+    add_job(job_repo, "https://example.com/0", "Stage avionique")
+    version = VersionRepository(db).get_version()
+    
+    jobs = [
+        {"link": f"https://example.com/{index}", "module": "thales", "company": "Thales", "title": "Stage logiciel", "tags": ["software"]}
+        for index in range(3)
+    ]
+    assert job_repo.add_jobs(jobs + [dict(jobs[1], title="Duplicate")]) == 2
+    
+    assert VersionRepository(db).get_version() == version + 1
+    assert db.query(JobChange).filter(JobChange.version == version + 1).count() == 2
+    assert {"name": "thales", "count": 2} in job_repo.get_facets()["modules"]
+    assert db.query(JobTag).filter(JobTag.tag == "software").count() == 2
+    assert job_repo.get_all_links() == {f"https://example.com/{index}" for index in range(3)}
+    assert job_repo.add_jobs(jobs) == 0
+
+
+def retag_all(job_repo):
+    return job_repo.retag_outdated_jobs(
+        tagging_service.tagJobs, tagging_service.tagMask, tagging_service.getDictionaryVersion()
+    )
+
+
+def test_retag_keeps_description_tags(db):
+    job_repo = JobRepository(db)
+    job = add_job(job_repo, "https://example.com/1", "Stage", "Développement logiciel embarqué")
+    assert sorted(job.tags) == ["research", "software"]
+    
+    processed, changed, _ = retag_all(job_repo)
+    db.refresh(job)
+    assert (processed, changed) == (1, 0)
+    assert sorted(job.tags) == ["research", "software"]
+    assert job.tag_version == tagging_service.getDictionaryVersion()
+    assert sorted(tag for (tag,) in db.query(JobTag.tag)) == ["research", "software"]
+
+
+def test_retag_updates_tags_from_title_and_description(db):
+    job_repo = JobRepository(db)
+    job = add_job(job_repo, "https://example.com/1", "Stage avionique", "Développement logiciel")
+    db.query(Job).update({"tags": ["management"], "tag_mask": tagging_service.tagMask(["management"])})
+    db.commit()
+    
+    assert retag_all(job_repo)[:2] == (1, 1)
+    db.refresh(job)
+    assert sorted(job.tags) == ["aerospace", "research", "software"]
+
+
+def test_jobs_without_stored_description_are_not_retagged(db):
+    job_repo = JobRepository(db)
+    job = add_job(job_repo, "https://example.com/1", "Stage", "Développement logiciel embarqué")
+    db.query(Job).update({"description": None})  # Stored before descriptions were kept
+    db.commit()
+    
+    assert job_repo.count_outdated_tags(tagging_service.getDictionaryVersion()) == 0
+    assert retag_all(job_repo) == (0, 0, None)
+    db.refresh(job)
+    assert sorted(job.tags) == ["research", "software"]
+
+
+def test_id_pages_reject_search_cursors(db):
+    job_repo = JobRepository(db)
+    for index in range(3):
+        add_job(job_repo, f"https://example.com/{index}", f"Stage #{index}")
+    
+    jobs, _, sort_keys = job_repo.query_jobs(limit=1)
+    assert job_repo.query_jobs(limit=1, after=list(sort_keys[0]))[0][0].id == jobs[0].id + 1
+    with pytest.raises(ValueError):
+        job_repo.query_jobs(limit=1, after=[-1.5, jobs[0].id])  # (rank, id) key of a search page
@@ -0,0 +1,30 @@
+"""
+Tests for LocationService.parseLocation on the location formats seen in scraped jobs.
+"""
+
+import pytest
+
+from location_service import LocationService
+
+location_service = LocationService()
+
+
+@pytest.mark.parametrize("location,expected", [
+    ("Toulouse, France", [("country", "france"), ("region", "occitanie"), ("department", "31"), ("city", "toulouse")]),
+    ("Blagnac (31)", [("country", "france"), ("region", "occitanie"), ("department", "31"), ("city", "blagnac")]),
+    ("31700 Blagnac", [("country", "france"), ("region", "occitanie"), ("department", "31"), ("city", "blagnac")]),
+    ("Garching 85748, Germany", [("country", "germany"), ("city", "garching")]),
+    ("Stuttgart 70565 Deutschland", [("country", "germany"), ("city", "stuttgart")]),
+    ("Munich, Allemagne", [("country", "germany"), ("city", "munich")]),
+    ("Vienne, Autriche", [("country", "austria")]),
+    ("", []),
+    (None, []),
+])
+def test_parse_location(location, expected):
+    assert location_service.parseLocation(location) == expected
+
+
+def test_unknown_city_keeps_postal_code_department():
+    assert location_service.parseLocation("Escalquens 31750") == [
+        ("country", "france"), ("region", "occitanie"), ("department", "31"), ("city", "escalquens"),
+    ]
@@ -0,0 +1,102 @@
+"""
+Tests for PersonalizedScoreCache: one ranking per profile and radius, scored outside the cache lock.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base
+from repositories.job_repository import JobRepository
+from score_cache import PersonalizedScoreCache
+from scoring_engine import ScoringEngine
+from tagging_service import TaggingService
+
+tagging_service = TaggingService(memo_size=0)
+
+
+class CountingScoringEngine(ScoringEngine):
+    """ScoringEngine counting full rankings per profile, optionally blocking one profile."""
+
+    def __init__(self):
+        super().__init__()
+        self.rankings = []
+        self.blocked_location = None
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release_timed_out = False
+
+    def scoreJobs(self, user_profile, jobs):
+        self.rankings.append((user_profile.get("location"), user_profile.get("radius_km")))
+        if user_profile.get("location") == self.blocked_location:
+            self.started.set()
+            self.release_timed_out = not self.release.wait(2)
+        return super().scoreJobs(user_profile, jobs)
+
+
+@pytest.fixture
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    make_session = sessionmaker(bind=engine)
+    db = make_session()
+    job_repo = JobRepository(db)
+    for index, title in enumerate(["Stage logiciel", "Stage avionique", "Stage qualité"]):
+        tags = tagging_service.tagJob(title)
+        job_repo.add_job({
+            "link": f"https://example.com/{index}",
+            "module": "airbus",
+            "company": "Airbus",
+            "title": title,
+            "location": "Paris",
+            "tags": tags,
+            "tag_mask": tagging_service.tagMask(tags),
+        })
+    db.close()
+    yield make_session
+    engine.dispose()
+
+
+def test_radius_overrides_keep_their_own_ranking(make_session):
+    scoring_engine = CountingScoringEngine()
+    score_cache = PersonalizedScoreCache(scoring_engine)
+    db = make_session()
+    profile = {"tags": ["software"], "location": "Paris"}
+
+    for radius_km in [None, 30, None, 30]:
+        score_cache.get_ranking(db, 1, dict(profile, radius_km=radius_km))
+    assert scoring_engine.rankings == [("Paris", None), ("Paris", 30)]
+
+    score_cache.invalidate(1)
+    score_cache.get_ranking(db, 1, dict(profile, radius_km=30))
+    assert len(scoring_engine.rankings) == 3
+    db.close()
+
+
+def test_cold_ranking_does_not_block_other_profiles(make_session):
+    scoring_engine = CountingScoringEngine()
+    scoring_engine.blocked_location = "Toulouse"
+    score_cache = PersonalizedScoreCache(scoring_engine)
+
+    def rank_blocked_profile():
+        db = make_session()
+        try:
+            score_cache.get_ranking(db, 1, {"tags": ["software"], "location": "Toulouse"})
+        finally:
+            db.close()
+
+    worker = threading.Thread(target=rank_blocked_profile)
+    worker.start()
+    try:
+        assert scoring_engine.started.wait(5)
+        db = make_session()
+        ranking = score_cache.get_ranking(db, 2, {"tags": ["software"], "location": "Paris"})
+        db.close()
+        assert [job["title"] for job in ranking][0] == "Stage logiciel"
+    finally:
+        scoring_engine.release.set()
+        worker.join(5)
+    assert not worker.is_alive()
+    assert not scoring_engine.release_timed_out  # Profile 2 did not wait for profile 1
@@ -0,0 +1,39 @@
+"""
+Tests for TagMemoRepository.save: insert, refresh and least recently used eviction.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, TagMemo
+from repositories.tag_memo_repository import TagMemoRepository
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[TagMemo.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_save_inserts_and_refreshes_entries(db):
+    repository = TagMemoRepository(db)
+    repository.save([("a", ["software"]), ("b", [])], limit=10)
+    repository.save([("a", ["research"]), ("c", ["aerospace"])], limit=10)
+    assert sorted(repository.get_recent(10)) == [("a", ["research"]), ("b", []), ("c", ["aerospace"])]
+
+
+def test_save_evicts_least_recently_used(db):
+    repository = TagMemoRepository(db)
+    repository.save([("old", []), ("kept", [])], limit=10)
+    last_week = datetime.now(timezone.utc) - timedelta(days=7)
+    db.query(TagMemo).filter(TagMemo.key == "old").update({"used_at": last_week})
+    db.commit()
+    
+    repository.save([("new", ["software"])], limit=2)
+    assert sorted(key for key, _ in repository.get_recent(10)) == ["kept", "new"]
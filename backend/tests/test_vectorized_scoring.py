@@ -0,0 +1,123 @@
+"""
+Parity tests: VectorizedScoringEngine must rank exactly like ScoringEngine.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from scoring_engine import ScoringEngine
+from tagging_service import TaggingService
+from vectorized_scoring import VectorizedScoringEngine
+
+tagging_service = TaggingService()
+VOCABULARY = tagging_service.getTagVocabulary()
+
+# (location, location_id, latitude, longitude)
+PLACES = [
+    ("Toulouse, France", 1, 43.6045, 1.4440),
+    ("Blagnac (31)", 2, 43.6373, 1.3903),
+    ("Paris", 3, 48.8566, 2.3522),
+    ("Bordeaux", None, 44.8378, -0.5792),
+    ("Remote", None, None, None),
+    ("", None, None, None),
+    (None, None, None, None),
+]
+
+# Few titles, so many jobs share a title (and differ only by ID)
+TITLES = ["Stage Ingénieur logiciel", "Software Engineer Intern", "Stage avionique", "stage avionique", "Data analyst"]
+
+PROFILES = [
+    {"tags": ["software", "aerospace"], "location": "Toulouse", "location_ids": {1, 2}},
+    {"tags": ["custom", "Research"], "location": None},
+    {"tags": [], "location": "paris"},
+    {"tags": ["engineering"], "location": "Toulouse", "location_ids": {1}, "coordinates": (43.6045, 1.4440), "radius_km": 50},
+    {"tags": ["management", "software"], "location": "Bordeaux", "coordinates": (44.8378, -0.5792), "radius_km": 600},
+    {"tags": [], "location": None},
+]
+
+
+def make_jobs(seed, count=400):
+    """Random jobs covering masked and unmasked tags, duplicate titles and missing locations."""
+    rnd = random.Random(seed)
+    jobs = []
+    for job_id in range(1, count + 1):
+        tags = rnd.sample(VOCABULARY, rnd.randint(0, 3))
+        if rnd.random() < 0.15:
+            tags.append("custom")  # Outside the vocabulary: no tag mask
+        location, location_id, latitude, longitude = rnd.choice(PLACES)
+        job = {
+            "id": job_id,
+            "title": rnd.choice(TITLES),
+            "location": location,
+            "location_id": location_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "tags": tags,
+            "tag_mask": tagging_service.tagMask(tags),
+            "new": rnd.random() < 0.3,
+            "freshness": rnd.choice([None, 0, 1, 3, 5]),
+        }
+        if rnd.random() < 0.5:
+            job["relevance"] = rnd.random()
+        jobs.append(job)
+    rnd.shuffle(jobs)
+    return jobs
+
+
+def signature(ranking):
+    return [(job["id"], job["match_score"], job["matching_tags"]) for job in ranking]
+
+
+@pytest.fixture(params=[1, 2, 3])
+def jobs(request):
+    return make_jobs(request.param)
+
+
+@pytest.fixture
+def engines():
+    return ScoringEngine(tag_vocabulary=VOCABULARY), VectorizedScoringEngine(tag_vocabulary=VOCABULARY)
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_score_jobs_identical(engines, jobs, profile):
+    python_engine, numpy_engine = engines
+    expected = signature(python_engine.scoreJobs(profile, jobs))
+    assert signature(numpy_engine.scoreJobs(profile, jobs)) == expected
+
+
+@pytest.mark.parametrize("profile", PROFILES[:5])
+@pytest.mark.parametrize("k,offset", [(10, 0), (7, 5), (20, 40), (5, 1000)])
+def test_score_top_k_identical(engines, jobs, profile, k, offset):
+    python_engine, numpy_engine = engines
+    expected_page, expected_total = python_engine.scoreTopK(profile, jobs, k, offset)
+    page, total = numpy_engine.scoreTopK(profile, jobs, k, offset)
+    assert total == expected_total
+    assert signature(page) == signature(expected_page)
+
+
+@pytest.mark.parametrize("profile", PROFILES[:5])
+def test_score_top_k_after_cursor_identical(engines, jobs, profile):
+    python_engine, numpy_engine = engines
+    ranking = python_engine.scoreJobs(profile, jobs)
+    for position in (0, 9, len(ranking) // 2):
+        if position >= len(ranking):
+            continue
+        after = ScoringEngine.sortKey(ranking[position])
+        expected_page, expected_total = python_engine.scoreTopK(profile, jobs, 10, after=after)
+        page, total = numpy_engine.scoreTopK(profile, jobs, 10, after=after)
+        assert total == expected_total
+        assert signature(page) == signature(expected_page) == signature(ranking[position + 1:position + 11])
+
+
+@pytest.mark.parametrize("k", [None, 15])
+def test_score_profiles_identical(engines, jobs, k):
+    python_engine, numpy_engine = engines
+    profiles = PROFILES[:5]
+    expected = [signature(ranking) for ranking in python_engine.scoreProfiles(profiles, jobs, k)]
+    assert [signature(ranking) for ranking in numpy_engine.scoreProfiles(profiles, iter(jobs), k)] == expected
+    for profile, ranking in zip(profiles, expected):
+        full_ranking = signature(python_engine.scoreJobs(profile, jobs))
+        assert ranking == (full_ranking if k is None else full_ranking[:k])
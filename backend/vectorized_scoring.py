@@ -0,0 +1,303 @@
+"""
+VectorizedScoringEngine - Array-backed scoring backend for bulk ranking.
+
+Holds the scoring inputs of a job list as NumPy columns (tag membership
+matrix, normalized location ids, new flag) and scores all jobs in one
+vectorized expression instead of a per-dict Python loop. Location matches and
+distance points are computed once per distinct location. Pages are selected
+with argpartition. Scores, matching tags and ordering are identical to
+ScoringEngine, which stays the default backend.
+
+NumPy is an optional dependency: NUMPY_AVAILABLE tells whether this backend
+can be used.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from scoring_engine import ScoringEngine
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+@dataclass
+class _JobColumns:
+    """Scoring inputs of a job list in columnar form."""
+    tag_matrix: Any  # (jobs x vocabulary) bool membership matrix
+    masked: Any  # bool, False for jobs scored by set intersection (no tag mask)
+    location_keys: Any  # int, index into locations
+    locations: List[tuple]  # Distinct (location_id, location, latitude, longitude) tuples
+    new: Any  # int 0/1
+    freshness: Any  # int, precomputed recency points
+    relevance_points: Any  # int, search relevance points (see ScoringEngine._relevancePoints)
+    titles: Any  # Lowercase titles (unicode array)
+    ids: Any  # int64 job IDs (0 when missing)
+
+
+class VectorizedScoringEngine(ScoringEngine):
+    """ScoringEngine computing scores over NumPy columns."""
+    
+    # Scoring the cached columns of the whole corpus is cheaper than a SQL prefilter
+    CANDIDATE_PREFILTER = False
+    
+    def __init__(self, tag_vocabulary: Optional[List[str]] = None):
+        """
+        Initialize VectorizedScoringEngine.
+        
+        Args:
+            tag_vocabulary: Tag vocabulary in bitmask order (see ScoringEngine)
+        
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the vectorized scoring engine")
+        super().__init__(tag_vocabulary)
+        self._tag_bit_values = np.array([1 << bit for bit in range(len(self._tag_vocabulary))], dtype=np.int64)
+        # Columns of the last job list scored, reused while the same list object comes back
+        self._columns_cache: Optional[Tuple[List[Dict[str, Any]], _JobColumns]] = None
+    
+    def scoreJobs(self, user_profile: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score all jobs based on user profile and return filtered, sorted results.
+        
+        The columns of `jobs` are kept until another list is scored, so
+        re-ranking the same (unmodified) list for another profile only costs
+        the vectorized scoring and the copies of the returned jobs.
+        
+        Args:
+            user_profile: User profile containing tags, location, etc.
+            jobs: List of job dictionaries to score
+        
+        Returns:
+            List of jobs with match_score and matching_tags, filtered and sorted by relevance
+        """
+        if not jobs:
+            return []
+        
+        columns = self._columnsFor(jobs)
+        scores, fallback_tags, user_tag_mask = self._scoreColumns(user_profile, jobs, columns)
+        ranking, _ = self._selectPage(jobs, columns, scores, fallback_tags, user_tag_mask, None)
+        return ranking
+    
+    def scoreTopK(
+        self,
+        user_profile: Dict[str, Any],
+        jobs: Iterable[Dict[str, Any]],
+        k: int,
+        offset: int = 0,
+        after: Optional[tuple] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Score jobs in one vectorized pass and return only one page of the ranking.
+        
+        Args:
+            user_profile: User profile containing tags, location, etc.
+            jobs: Iterable of job dictionaries to score
+            k: Number of jobs to return
+            offset: Number of top-ranked jobs to skip
+            after: Optional sort key of the last job of the previous page (keyset pagination)
+        
+        Returns:
+            Tuple of (page of jobs with match_score and matching_tags,
+            total number of positively scored jobs)
+        """
+        if not isinstance(jobs, list):
+            jobs = list(jobs)
+        if not jobs:
+            return [], 0
+        
+        columns = self._columnsFor(jobs)
+        scores, fallback_tags, user_tag_mask = self._scoreColumns(user_profile, jobs, columns)
+        return self._selectPage(jobs, columns, scores, fallback_tags, user_tag_mask, offset + k, offset, after)
+    
+    def _selectPage(
+        self,
+        jobs: List[Dict[str, Any]],
+        columns: _JobColumns,
+        scores: Any,
+        fallback_tags: Dict[int, List[str]],
+        user_tag_mask: int,
+        wanted: Optional[int],
+        offset: int = 0,
+        after: Optional[tuple] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Select ranks offset..wanted of the positively scored jobs (all ranks if wanted is None).
+        
+        Returns:
+            Tuple of (selected jobs with match_score and matching_tags,
+            total number of positively scored jobs)
+        """
+        positive = scores > 0
+        total_items = int(positive.sum())
+        if after is not None:
+            positive &= self._afterMask(columns, scores, after)
+        candidates = np.flatnonzero(positive)
+        
+        if wanted is not None and 0 < wanted < len(candidates):
+            rank_keys = self._compositeKeys(columns, scores, candidates)
+            if rank_keys is not None:
+                candidates = candidates[np.argpartition(rank_keys, wanted - 1)[:wanted]]
+        top = candidates[self._lexsort(columns, scores, candidates)][offset:wanted]
+        
+        page = [self._enhance(jobs[i], columns, scores, fallback_tags, user_tag_mask, i) for i in top]
+        return page, total_items
+    
+    def _columnsFor(self, jobs: List[Dict[str, Any]]) -> _JobColumns:
+        """Columns of a job list, reused if it is the list scored last."""
+        cached = self._columns_cache
+        if cached is not None and cached[0] is jobs and len(cached[1].ids) == len(jobs):
+            return cached[1]
+        
+        columns = self._buildColumns(jobs)
+        self._columns_cache = (jobs, columns)
+        return columns
+    
+    def _buildColumns(self, jobs: List[Dict[str, Any]]) -> _JobColumns:
+        """Convert job dictionaries into scoring columns."""
+        tag_masks = [job.get("tag_mask") if self._tag_bits else None for job in jobs]
+        masked = np.array([tag_mask is not None for tag_mask in tag_masks], dtype=bool)
+        mask_values = np.array([tag_mask or 0 for tag_mask in tag_masks], dtype=np.int64)
+        tag_matrix = (mask_values[:, None] & self._tag_bit_values) != 0
+        
+        # Index distinct locations so each one is matched only once
+        location_index: Dict[tuple, int] = {}
+        location_keys = np.fromiter(
+            (
+                location_index.setdefault(
+                    (job.get("location_id"), job.get("location"), job.get("latitude"), job.get("longitude")),
+                    len(location_index),
+                )
+                for job in jobs
+            ),
+            dtype=np.int64,
+            count=len(jobs),
+        )
+        
+        return _JobColumns(
+            tag_matrix=tag_matrix,
+            masked=masked,
+            location_keys=location_keys,
+            locations=list(location_index),
+            new=np.array([int(job.get("new", False)) for job in jobs], dtype=np.int64),
+            freshness=np.array([job.get("freshness") or 0 for job in jobs], dtype=np.int64),
+            relevance_points=np.array([self._relevancePoints(job.get("relevance")) for job in jobs], dtype=np.int64),
+            titles=np.array([job.get("title", "").lower() for job in jobs], dtype=str),
+            ids=np.array([job.get("id") or 0 for job in jobs], dtype=np.int64),
+        )
+    
+    def _scoreColumns(
+        self,
+        user_profile: Dict[str, Any],
+        jobs: List[Dict[str, Any]],
+        columns: _JobColumns,
+    ) -> Tuple[Any, Dict[int, List[str]], int]:
+        """
+        Compute the score of every job.
+        
+        Returns:
+            Tuple of (int64 score array, matching tags of the jobs scored by set
+            intersection keyed by position, user tag mask)
+        """
+        context = self._profileContext(user_profile)
+        _, user_location_lower, user_tag_mask, user_location_ids, user_geo = context
+        
+        # Tag matches: membership matrix times the profile's tag indicator vector
+        profile_vector = (self._tag_bit_values & user_tag_mask) != 0
+        scores = (columns.tag_matrix @ profile_vector.astype(np.int64)) * self.TAG_MATCH_POINTS
+        
+        scores += columns.new * self.NEW_JOB_BONUS_POINTS
+        
+        if user_location_lower or user_geo is not None:
+            location_points = [
+                self._locationPoints(*location, user_location_lower, user_location_ids, user_geo)
+                for location in columns.locations
+            ]
+            # -1 marks locations outside the radius
+            points = np.array([-1 if value is None else value for value in location_points], dtype=np.int64)
+            job_points = points[columns.location_keys]
+            scores += job_points
+            scores[job_points < 0] = 0
+        
+        # Recency and search relevance only reorder jobs that match the profile
+        scores += np.where(scores > 0, columns.freshness + columns.relevance_points, 0)
+        
+        # Jobs without a tag mask go through the Python scorer
+        fallback_tags = {}
+        for i in np.flatnonzero(~columns.masked):
+            score, matching_tags = self._calculateScoreOptimized(jobs[i], *context)
+            scores[i] = score
+            fallback_tags[int(i)] = matching_tags
+        
+        return scores, fallback_tags, user_tag_mask
+    
+    def _lexsort(self, columns: _JobColumns, scores: Any, indices: Any) -> Any:
+        """Positions sorting `indices` in sortKey order (stable)."""
+        return np.lexsort((
+            columns.ids[indices],
+            columns.titles[indices],
+            -columns.new[indices],
+            -scores[indices],
+        ))
+    
+    def _compositeKeys(self, columns: _JobColumns, scores: Any, indices: Any) -> Optional[Any]:
+        """
+        Pack the sortKey of `indices` into one int64 per job for argpartition.
+        
+        Returns:
+            Array of keys ordered like sortKey, or None if they would overflow
+        """
+        _, title_ranks = np.unique(columns.titles[indices], return_inverse=True)
+        _, id_ranks = np.unique(columns.ids[indices], return_inverse=True)
+        selected_scores = scores[indices]
+        max_score = int(selected_scores.max())
+        
+        title_span = int(title_ranks.max()) + 1
+        id_span = int(id_ranks.max()) + 1
+        score_span = max_score - int(selected_scores.min()) + 1
+        if score_span * 2 * title_span * id_span >= 2 ** 62:
+            return None
+        
+        keys = (max_score - selected_scores) * 2 + (1 - columns.new[indices])
+        return (keys * title_span + title_ranks) * id_span + id_ranks
+    
+    def _afterMask(self, columns: _JobColumns, scores: Any, after: tuple) -> Any:
+        """Jobs whose sortKey is strictly greater than `after`."""
+        neg_score, neg_new, title, job_id = after
+        neg_scores = -scores
+        neg_news = -columns.new
+        return (neg_scores > neg_score) | (
+            (neg_scores == neg_score) & (
+                (neg_news > neg_new) | (
+                    (neg_news == neg_new) & (
+                        (columns.titles > title) | ((columns.titles == title) & (columns.ids > job_id))
+                    )
+                )
+            )
+        )
+    
+    def _enhance(
+        self,
+        job: Dict[str, Any],
+        columns: _JobColumns,
+        scores: Any,
+        fallback_tags: Dict[int, List[str]],
+        user_tag_mask: int,
+        i: int,
+    ) -> Dict[str, Any]:
+        """Copy a job with its match_score and matching_tags."""
+        i = int(i)
+        if i in fallback_tags:
+            matching_tags = fallback_tags[i]
+        else:
+            matching_tags = list(self._maskTags(job["tag_mask"] & user_tag_mask))
+        
+        enhanced_job = job.copy()
+        enhanced_job["match_score"] = int(scores[i])
+        enhanced_job["matching_tags"] = matching_tags
+        return enhanced_job